@@ -5,12 +5,24 @@ from google.oauth2.service_account import Credentials
 import pandas as pd
 import time
 import io
+import html
 import re
-import json
 import urllib.parse
-import concurrent.futures
+import threading
+from collections import deque
 from math import ceil
 from datetime import datetime, timedelta, timezone
+import sheet_sync
+import snapshot_store
+import text_index
+import view_index
+import xlsx_export
+import custom_components
+import bulk_import
+import link_index
+import num_eng
+import review_scheduler
+import perf
 
 # --- [페이지 기본 설정] ---
 st.set_page_config(layout="wide", page_title="TOmBOy94 English")
@@ -29,6 +41,10 @@ if 'is_simple' not in st.session_state: st.session_state.is_simple = False
 if 'curr_p' not in st.session_state: st.session_state.curr_p = 1
 if 'app_mode' not in st.session_state: st.session_state.app_mode = 'English' 
 
+# ★ rerun 단위 성능 계측 - ?perf=1 또는 secrets 의 perf_panel = true 일 때만 (화면 맨 아래 패널 + .cache/perf.jsonl)
+perf.start("study" if st.query_params.get("study") == "true" else st.session_state.app_mode,
+           st.query_params.get("perf") == "1" or bool(st.secrets.get("perf_panel", False)))
+
 # --- [보안 설정 및 Google Sheets 연결] ---
 LOGIN_PASSWORD = st.secrets["tom_password"]
 
@@ -48,38 +64,79 @@ def reset_page():
 def set_state(key, val):
     st.session_state[key] = val
 
+def cycle_sort_order():
+    st.session_state.sort_order = 'asc' if st.session_state.sort_order == 'None' else ('desc' if st.session_state.sort_order == 'asc' else 'None')
+
+# ★ 영어 목록 그리드 클릭 - 정렬은 바로 반영, 수정은 본문에서 다이얼로그를 띄우도록 넘겨 둔다 (콜백 안에서는 다이얼로그 불가)
+def handle_grid_event():
+    ev = st.session_state.get("eng_grid") or {}
+    if ev.get("action") == "sort": cycle_sort_order()
+    elif ev.get("action") == "edit": st.session_state.grid_edit = (ev.get("sheet"), ev.get("row"), ev.get("uid"))
+
+# ★ 행 ID(uid) 로 현재 행 찾기 - 다른 쓰기로 행 번호가 밀려도 같은 행을 가리킨다 (고쳐지거나 없어진 행의 uid 는 빠진다)
+def find_rows(df, uids):
+    pos = pd.Index(df['uid']).get_indexer(list(uids))
+    return df.iloc[pos[pos >= 0]]
+
+def current_row_idx(df, uid, row_idx):
+    # 수정창을 연 뒤 행 번호가 바뀌었으면 새 번호, 행이 바뀌었거나 지워졌으면 None
+    if uid is None: return row_idx
+    hit = find_rows(df, [uid])
+    return int(hit['row_idx'].iat[0]) if len(hit) else None
+
+# ★ 랜덤 10 - 행 위치만 뽑아 uid 10개만 세션에 둔다 (행 번호 대신 uid → 쓰기/동기화 뒤에도 같은 항목)
+# ?random=category → 분류마다 같은 확률, ?random=fresh → 최근 보여 준 RANDOM_RECENT 개는 다시 뽑지 않음 (둘 다: category,fresh)
+def pick_random_uids(df, cat_index, uid_index):
+    opts = st.query_params.get("random", "").split(",")
+    recent = st.session_state.setdefault("random_recent", deque(maxlen=view_index.RANDOM_RECENT))
+    exclude = None
+    if "fresh" in opts and recent:
+        exclude = uid_index.get_indexer(list(recent))
+        exclude = exclude[exclude >= 0]
+    pos = view_index.sample_positions(len(df), 10, cat_index if "category" in opts else None, exclude)
+    uids = df['uid'].iloc[pos].tolist()
+    recent.extend(uids)
+    return uids
+
+def follow_random_uid(old_uid, sheet_idx, row_idx):
+    # 랜덤 10 에서 고친 행은 내용(=uid)이 바뀌므로 새 uid 로 이어 준다
+    uids = st.session_state.get("random_uids")
+    if not uids or old_uid not in uids: return
+    df = _english_sync_state()["df"]
+    hit = df[(df['sheet_idx'] == sheet_idx) & (df['row_idx'] == row_idx)]
+    st.session_state.random_uids = [hit['uid'].iat[0] if u == old_uid and len(hit) else u for u in uids]
+
+# ★ 캐시 키용 데이터 버전 - 시트 로더가 붙여 둔 df.attrs["version"] (없으면 내용 해시)
+# CSV/인쇄 캐시는 DataFrame 대신 (버전, 필터 서명) 으로 찾는다 → 큰 표를 매번 해시하지 않는다
+def view_key(df):
+    v = df.attrs.get("version")
+    return v if v is not None else str(pd.util.hash_pandas_object(df).sum())
+
 # ★ 안전한 CSV 변환 전용 함수
-@st.cache_data(show_spinner=False)
-def convert_df_to_csv(df_to_convert):
-    return df_to_convert.to_csv(index=False).encode('utf-8-sig')
-
-# ★ 초고속 인쇄용 HTML 텍스트 생성기 
-@st.cache_data(show_spinner=False)
-def generate_print_html(df, title):
-    print_df = df.drop(columns=['sheet_idx', 'row_idx'], errors='ignore')
+@perf.cached(st.cache_data(show_spinner=False, max_entries=16))
+def convert_df_to_csv(_df_to_convert, version, sig):
+    return _df_to_convert.drop(columns=['uid'], errors='ignore').to_csv(index=False).encode('utf-8-sig')
+
+# ★ 초고속 인쇄용 HTML 텍스트 생성기 - 셀을 구분 문자로 이어 붙여 한 번에 이스케이프한 뒤 태그로 바꾼다
+_CELL, _ROW = "\x01", "\x02"   # str.cat 은 구분자의 \x00 을 버린다
+
+@perf.cached(st.cache_data(show_spinner=False, max_entries=16))
+def generate_print_html(_df, title, version, sig):
+    print_df = _df.drop(columns=['sheet_idx', 'row_idx', 'uid'], errors='ignore')
     if print_df.empty: return "", 0
     
-    cols = print_df.columns.tolist()
-    parts = ["<table><thead><tr>"]
-    for c in cols:
-        parts.append(f"<th>{c}</th>")
-    parts.append("</tr></thead><tbody>")
-    
-    for row in print_df.itertuples(index=False):
-        parts.append("<tr>")
-        for val in row:
-            val_str = str(val).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;').replace("'", '&#39;')
-            parts.append(f"<td>{val_str}</td>")
-        parts.append("</tr>")
-        
-    parts.append("</tbody></table>")
-    table_html = "".join(parts)
+    cols = [print_df[c].astype(str) for c in print_df.columns]
+    joined = cols[0].str.cat(cols[1:], sep=_CELL) if len(cols) > 1 else cols[0]
+    body = html.escape(_ROW.join(joined.tolist()), quote=True).replace(_CELL, "</td><td>").replace(_ROW, "</td></tr><tr><td>")
+    head = "".join(f"<th>{html.escape(str(c))}</th>" for c in print_df.columns)
+    table_html = f"<table><thead><tr>{head}</tr></thead><tbody><tr><td>{body}</td></tr></tbody></table>"
     
     return table_html.replace('\\', '\\\\').replace('`', '\\`').replace('$', '\\$'), len(print_df)
 
 # ★ 네이티브 렌더링 인쇄 함수 
-def print_table(df, title):
-    html_table, count = generate_print_html(df, title)
+def print_table(df, title, sig=None):
+    with perf.phase("print"):
+        html_table, count = generate_print_html(df, title, view_key(df), sig)
     if not html_table: return
 
     js = f"""
@@ -124,326 +181,363 @@ def print_table(df, title):
     components.html(js, height=0)
 
 
-# --- [전체화면 학습 모드 컴포넌트 렌더링 함수] ---
-def render_study_mode(study_data, unique_cats, initial_cat):
-    data_json = json.dumps(study_data, ensure_ascii=False)
-    cats_json = json.dumps(unique_cats, ensure_ascii=False)
-    
-    html_code = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-    <style>
-        body {{ margin: 0; padding: 0; background: #0a0a0a; overflow: hidden; font-family: sans-serif; cursor: pointer; user-select: none; -webkit-user-select: none; }}
-        .container {{ width: 100vw; height: 100vh; display: flex; flex-direction: column; justify-content: space-between; align-items: center; position: relative; }}
-        .header-bar {{ position: absolute; top: 20px; left: 30px; right: 30px; display: flex; justify-content: space-between; align-items: center; z-index: 100; cursor: default; }}
-        .left-controls {{ display: flex; gap: 15px; align-items: center; flex-wrap: wrap; background: rgba(0,0,0,0.5); padding: 5px 15px; border-radius: 15px; }}
-        .cat-select {{ background: transparent; color: #FFFFFF; border: none; padding: 8px 10px; font-size: 18px; border-radius: 8px; font-weight: bold; cursor: pointer; outline: none; transition: 0.3s; appearance: none; -webkit-appearance: none; text-align: center; }}
-        .cat-select:hover {{ background: rgba(255,255,255,0.15); }}
-        .cat-select option {{ background: #0a0a0a; color: #FFFFFF; }}
-        .playback-controls {{ display: flex; gap: 8px; border-left: 1px solid rgba(255,255,255,0.2); border-right: 1px solid rgba(255,255,255,0.2); padding: 0 15px; }}
-        .playback-controls button {{ background: rgba(255,255,255,0.15); border: none; color: white; font-size: 14px; padding: 8px 14px; border-radius: 8px; cursor: pointer; transition: 0.3s; font-weight: bold; box-shadow: 0 4px 6px rgba(0,0,0,0.3); }}
-        .playback-controls button:hover {{ background: rgba(255,255,255,0.3); transform: translateY(-2px); }}
-        .playback-controls button:active {{ transform: translateY(0); box-shadow: 0 2px 4px rgba(0,0,0,0.3); }}
-        .simple-btn {{ background: rgba(255,255,255,0.15); border: none; color: white; font-size: 14px; padding: 8px 14px; border-radius: 8px; cursor: pointer; transition: 0.3s; font-weight: bold; box-shadow: 0 4px 6px rgba(0,0,0,0.3); margin-left: 5px; }}
-        .simple-btn:hover {{ background: rgba(255,255,255,0.3); transform: translateY(-2px); }}
-        .simple-btn:active {{ transform: translateY(0); box-shadow: 0 2px 4px rgba(0,0,0,0.3); }}
-        #word-cat-display {{ color: #FFFFFF; font-weight: bold; font-size: 17px; margin-left: 5px; padding-left: 15px; border-left: 1px solid rgba(255,255,255,0.2); opacity: 0.8; letter-spacing: 1px; }}
-        #rolling-container {{ flex: 1; display: flex; flex-direction: column; justify-content: center; position: relative; width: 100%; text-align: center; align-items: center; padding: 0 20px; }}
-    </style>
-    </head>
-    <body>
-    <div class="container">
-        <div class="header-bar">
-            <div class="left-controls">
-                <select id="category-select" class="cat-select" onchange="changeCategory()"></select>
-                <div class="playback-controls">
-                    <button onclick="movePrev()">&lt;</button>
-                    <button onclick="togglePause()" id="pause-btn">멈춤</button>
-                    <button onclick="moveNext()">&gt;</button>
-                </div>
-                <select id="speed-select" class="cat-select" onchange="changeSpeed()">
-                    <option value="2300">2.3초</option>
-                    <option value="4000">4초</option>
-                    <option value="7000">7초</option>
-                    <option value="10000" selected>10초</option>
-                    <option value="15000">15초</option>
-                    <option value="20000">20초</option>
-                    <option value="30000">30초</option>
-                </select>
-                <button id="touch-btn" class="simple-btn" onclick="toggleTouchMode()">👆 TOUCH OFF</button>
-                <button id="simple-btn" class="simple-btn" onclick="toggleSimpleMode()">SIMPLE OFF</button>
-                <button id="tts-btn" class="simple-btn" onclick="toggleTTS()">🔇 소리 끄기</button>
-                <span id="word-cat-display"></span>
-            </div>
-        </div>
-        <div id="rolling-container"></div>
-    </div>
-    <script>
-        const rawData = {data_json};
-        const categories = {cats_json};
-        let filteredData = [];
-        let currentIndex = 0;
-        let intervalId;
-        let isPaused = false;
-        let currentSpeed = 10000;
-        let isSimpleMode = false;
-        let isTTSEnabled = false;
-        let isTouchMode = false; 
-        let availableVoices = [];
-
-        function loadVoices() {{ availableVoices = window.speechSynthesis.getVoices(); }}
-        loadVoices();
-        if (window.speechSynthesis.onvoiceschanged !== undefined) {{ window.speechSynthesis.onvoiceschanged = loadVoices; }}
-
-        const selectEl = document.getElementById('category-select');
-        let allOpt = document.createElement('option');
-        allOpt.value = "ALL"; allOpt.innerText = "전체 랜덤"; selectEl.appendChild(allOpt);
-        
-        categories.forEach(cat => {{
-            let opt = document.createElement('option');
-            opt.value = cat; opt.innerText = cat;
-            if (cat === "{initial_cat}") opt.selected = true;
-            selectEl.appendChild(opt);
-        }});
-        if ("{initial_cat}" === "ALL") {{ selectEl.value = "ALL"; }}
-
-        function changeSpeed() {{ currentSpeed = parseInt(document.getElementById('speed-select').value); if(!isPaused && !isTouchMode) resetInterval(); }}
-        
-        function shuffle(array) {{
-            let arr = [...array];
-            for (let i = arr.length - 1; i > 0; i--) {{ const j = Math.floor(Math.random() * (i + 1)); [arr[i], arr[j]] = [arr[j], arr[i]]; }}
-            return arr;
-        }}
-
-        function changeCategory() {{
-            const selected = selectEl.value;
-            if (selected === "ALL") {{ filteredData = shuffle(rawData); }} 
-            else {{ let catData = rawData.filter(d => d.cat === selected); filteredData = shuffle(catData); }}
-            currentIndex = 0; renderRolling(); resetInterval();
-        }}
-
-        function movePrev() {{ if (!filteredData || filteredData.length === 0) return; currentIndex = (currentIndex - 1 + filteredData.length) % filteredData.length; renderRolling(); resetInterval(); }}
-        function moveNext() {{ if (!filteredData || filteredData.length === 0) return; currentIndex = (currentIndex + 1) % filteredData.length; renderRolling(); resetInterval(); }}
-        
-        function togglePause() {{
-            isPaused = !isPaused;
-            const btn = document.getElementById('pause-btn');
-            if(isPaused) {{ if (intervalId) clearInterval(intervalId); btn.innerText = "재생"; btn.style.background = "rgba(255,255,255,0.3)"; }} 
-            else {{ resetInterval(); btn.innerText = "멈춤"; btn.style.background = "rgba(255,255,255,0.15)"; }}
-        }}
-
-        function toggleTouchMode() {{
-            isTouchMode = !isTouchMode;
-            const btn = document.getElementById('touch-btn');
-            if(isTouchMode) {{ btn.style.background = "rgba(230,126,34,0.7)"; btn.innerText = "👆 TOUCH ON"; if (intervalId) clearInterval(intervalId); }} 
-            else {{ btn.style.background = "rgba(255,255,255,0.15)"; btn.innerText = "👆 TOUCH OFF"; resetInterval(); }}
-        }}
-
-        function toggleSimpleMode() {{
-            isSimpleMode = !isSimpleMode;
-            const btn = document.getElementById('simple-btn');
-            if(isSimpleMode) {{ btn.style.background = "rgba(230,126,34,0.7)"; btn.innerText = "SIMPLE ON"; }} 
-            else {{ btn.style.background = "rgba(255,255,255,0.15)"; btn.innerText = "SIMPLE OFF"; }}
-            renderRolling(); 
-        }}
-
-        function toggleTTS() {{
-            isTTSEnabled = !isTTSEnabled;
-            const btn = document.getElementById('tts-btn');
-            if(isTTSEnabled) {{
-                btn.style.background = "rgba(230,126,34,0.7)"; btn.innerText = "🔊 소리 켜기";
-                if(filteredData.length > 0) {{ window.speechSynthesis.cancel(); speakText(filteredData[currentIndex].en, 'en-US'); if(filteredData[currentIndex].ko) speakText(filteredData[currentIndex].ko, 'ko-KR'); }}
-            }} else {{
-                btn.style.background = "rgba(255,255,255,0.15)"; btn.innerText = "🔇 소리 끄기"; window.speechSynthesis.cancel();
-            }}
-        }}
-
-        function speakText(text, lang) {{
-            if (!window.speechSynthesis) return;
-            const cleanText = text.replace(/[/?()[\\]~]/g, ' ');
-            const utterance = new SpeechSynthesisUtterance(cleanText);
-            utterance.lang = lang; utterance.rate = lang === 'en-US' ? 0.95 : 0.9; utterance.pitch = 1.0;
-
-            if (availableVoices.length > 0) {{
-                let bestVoice = null;
-                if (lang === 'en-US') {{
-                    bestVoice = availableVoices.find(voice => voice.name === 'Google US English');
-                    if (!bestVoice) bestVoice = availableVoices.find(voice => voice.name.includes('Natural') && voice.lang === 'en-US');
-                    if (!bestVoice) bestVoice = availableVoices.find(voice => (voice.name === 'Samantha' || voice.name === 'Alex') && voice.lang === 'en-US');
-                    if (!bestVoice) bestVoice = availableVoices.find(voice => voice.lang === 'en-US' && (voice.name.includes('Premium') || voice.name.includes('Enhanced')));
-                    if (!bestVoice) bestVoice = availableVoices.find(voice => voice.lang === 'en-US');
-                }} else if (lang === 'ko-KR') {{
-                    bestVoice = availableVoices.find(voice => voice.name === 'Google 한국의');
-                    if (!bestVoice) bestVoice = availableVoices.find(voice => voice.name.includes('Natural') && voice.lang.includes('ko'));
-                    if (!bestVoice) bestVoice = availableVoices.find(voice => voice.lang.includes('ko-KR'));
-                }}
-                if (bestVoice) utterance.voice = bestVoice;
-            }}
-            window.speechSynthesis.speak(utterance);
-        }}
-
-        // ★ 학습 효율 극대화: 깔끔한 플래시카드 디자인 (겹침 오류 완벽 방지)
-        function renderRolling() {{
-            if (!filteredData || filteredData.length === 0) return;
-            const container = document.getElementById('rolling-container');
-            
-            // ★ 이전 요소를 완전히 비우고 렌더링하여 겹침 문제 100% 차단
-            container.innerHTML = '';
-
-            const item = filteredData[currentIndex];
-            document.getElementById('word-cat-display').innerText = item.cat;
-
-            // 화면 크기에 맞춘 유동적 폰트 사이즈
-            let enFontSize = item.en.length > 25 ? 'min(6vw, 8vh)' : 'min(8vw, 11vh)';
-            let pronSize = 'min(3vw, 4vh)';
-            let koSize = 'min(4.5vw, 6vh)';
-            let memoSize = 'min(2.5vw, 3.5vh)';
-
-            let pronHtml = (item.pron && item.pron.length <= 60) ? `<p style="font-size: ${{pronSize}}; color: #A3B8B8; margin: 0 0 2vh 0; font-weight: 500; font-style: italic;">[ ${{item.pron}} ]</p>` : "";
-            
-            let koHtml = item.ko ? `<p style="color: #FFFFFF; font-size: ${{koSize}}; font-weight: 700; margin: 2vh 0 0 0; word-break: keep-all; line-height: 1.4; letter-spacing: -0.5px;">${{item.ko}}</p>` : "";
-            
-            let memoHtml = "";
-            if (!isSimpleMode && (item.memo1 || item.memo2)) {{
-                memoHtml = `
-                <div style="
-                    margin-top: 4vh; 
-                    width: 100%;
-                    max-width: 900px;
-                    text-align: center;
-                    display: inline-block;
-                ">
-                    ${{item.memo1 ? `<p style="color: #FFFACD; font-size: ${{memoSize}}; font-weight: 500; margin: 0 0 1vh 0; word-break: keep-all; line-height: 1.5;">${{item.memo1}}</p>` : ''}}
-                    ${{item.memo2 ? `<p style="color: #E0FFFF; font-size: ${{memoSize}}; font-weight: 500; margin: 0; word-break: keep-all; line-height: 1.5;">${{item.memo2}}</p>` : ''}}
-                </div>`;
-            }}
-
-            // 부드러운 전환 효과 없이 즉각 표시되는 컨테이너
-            const cardHtml = `
-                <div style="
-                    position: absolute; 
-                    width: 100%; 
-                    left: 0; 
-                    top: 50%; 
-                    transform: translateY(-50%); 
-                    padding: 0 2vw; 
-                    box-sizing: border-box; 
-                    z-index: 10;
-                ">
-                    <div style="
-                        background: transparent;
-                        padding: min(5vh, 40px) min(4vw, 40px);
-                        width: 95%;
-                        max-width: 1200px;
-                        margin: 0 auto;
-                        display: flex;
-                        flex-direction: column;
-                        align-items: center;
-                        text-align: center;
-                    ">
-                        <!-- 가장 중요한 영어 문장 -->
-                        <div style="color: #FFD700; font-weight: 900; text-shadow: 0 4px 15px rgba(255, 215, 0, 0.2); width: 100%;">
-                            <p style="font-size: ${{enFontSize}}; margin: 0; padding-bottom: 1vh; letter-spacing: 0.5px; word-break: keep-all; line-height: 1.2;">${{item.en}}</p>
-                        </div>
-                        
-                        <!-- 발음 기호 -->
-                        ${{pronHtml}}
-                        
-                        <!-- 시각적 구분을 위한 라인 -->
-                        ${{item.ko ? `<div style="width: 80%; height: 2px; background: linear-gradient(90deg, transparent, rgba(255,255,255,0.15), transparent); margin: 1vh 0;"></div>` : ''}}
-                        
-                        <!-- 해석 및 메모 -->
-                        ${{koHtml}}
-                        ${{memoHtml}}
-                    </div>
-                </div>
-            `;
-
-            container.innerHTML = cardHtml;
-
-            // 음성 재생 로직 (지연 없음)
-            if(isTTSEnabled) {{ window.speechSynthesis.cancel(); speakText(item.en, 'en-US'); if(item.ko) speakText(item.ko, 'ko-KR'); }}
-        }}
-
-        function step() {{ currentIndex = (currentIndex + 1) % filteredData.length; renderRolling(); }}
-        function resetInterval() {{ if (intervalId) clearInterval(intervalId); if (!isTouchMode && !isPaused) {{ intervalId = setInterval(step, currentSpeed); }} }}
-        document.body.addEventListener('click', function(e) {{ if (e.target.closest('.header-bar')) return; if (isTouchMode) {{ moveNext(); }} }});
-
-        changeCategory();
-    </script>
-    </body>
-    </html>
-    """
-    components.html(html_code, height=1000)
-
-@st.cache_resource(ttl=3000)  # gspread 토큰 ~1시간 만료 → 50분마다 자동 갱신
+# --- [전체화면 학습 모드] ---
+# 화면은 frontend/study/index.html (custom_components.study_mode). 분류별 JSON 조각은 데이터 버전마다 한 번만 만든다
+def handle_study_event():
+    ev = st.session_state.get("study") or {}
+    if ev.get("action") == "load": st.session_state.study_want = list(ev.get("cats") or [])
+    elif ev.get("action") == "review": st.session_state.study_review = ev
+
+# ★ 복습 모드 - 브라우저(사용자)별 복습 큐. 받은 답을 반영·저장하고 다음 REVIEW_BATCH 장만 돌려준다 (덱 전체를 보내지 않는다)
+@st.cache_resource
+def _review_registry():
+    reg = review_scheduler.new_registry()
+    reg["lock"] = threading.Lock()
+    return reg
+
+def _is_int(v):
+    return isinstance(v, int) and not isinstance(v, bool)
+
+def review_batch(df, version, ev):
+    # 브라우저가 보낸 값은 믿지 않는다 - 형식이 틀린 요청은 답하지 않고 버린다 (페이지 전체가 오류로 바뀌지 않도록)
+    n, k, deck, graded = ev.get("n"), ev.get("k", review_scheduler.REVIEW_BATCH), ev.get("cat") or "ALL", ev.get("graded") or []
+    if not (_is_int(n) and _is_int(k) and isinstance(deck, str) and isinstance(graded, list)):
+        return None
+    user, client = ev.get("user"), ev.get("client")
+    if not (review_scheduler.valid_id(user) and review_scheduler.valid_id(client)):
+        return {"n": n, "error": "복습 기록을 남길 수 없는 브라우저입니다 (사용자 ID 오류)"}
+    k = max(0, min(k, review_scheduler.REVIEW_BATCH))
+    def deck_uids():
+        return (df['uid'] if deck == "ALL" else df['uid'].iloc[english_category_index(df).positions(deck)]).tolist()
+    now = time.time()
+    reg = _review_registry()
+    with reg["lock"]:
+        q = review_scheduler.queue_for(reg, user, deck, deck_uids, version)
+        graded, ack = review_scheduler.fresh_grades(reg, user, client, graded)
+        uid_index = english_uid_index(version, df)
+        changed = q.grade([(u, g) for u, g in graded if u in uid_index], now)   # 지금 데이터에 없는 uid 는 기록하지 않는다
+        if changed: review_scheduler.save_user(user, changed)
+        uids = q.next_batch(k, now)
+        due, new, upcoming = q.remaining(now)
+        pos = uid_index.get_indexer(uids)
+        cards = custom_components.review_cards(df.iloc[pos[pos >= 0]], q.records)
+    return {"n": n, "ack": ack, "cat": deck, "cards": cards, "due": due, "new": new, "next": upcoming}
+
+@perf.cached(st.cache_resource(ttl=3000))  # gspread 토큰 ~1시간 만료 → 50분마다 자동 갱신
 def init_connection():
-    scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-    creds = Credentials.from_service_account_info(st.secrets["gcp_service_account"], scopes=scopes)
-    return gspread.authorize(creds)
-
-def _fetch_sheet_concurrently(wb, sheet_name):
-    try:
-        sheet = wb.worksheet(sheet_name)
-        data = sheet.get_all_values()
-        if not data: 
-            return pd.DataFrame()
-            
-        rows = [row[:6] + [""] * (6 - len(row[:6])) for row in data[1:]]
-        
-        df = pd.DataFrame(rows, columns=['분류', '단어-문장', '해석', '발음', '메모1', '메모2'])
-        for col in df.columns: df[col] = df[col].astype(str).str.strip()
-        
-        df = df[df['단어-문장'] != ""]
-        
-        df['sheet_idx'] = sheet_name
-        df['row_idx'] = df.index + 2
-        return df.sort_values(by='row_idx', ascending=True)
-    except Exception as e:
-        print(f"Error loading sheet {sheet_name}: {e}")
-        return pd.DataFrame()
+    with perf.phase("connect"):
+        scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+        creds = Credentials.from_service_account_info(st.secrets["gcp_service_account"], scopes=scopes)
+        return gspread.authorize(creds)
+
+@perf.cached(st.cache_resource(ttl=3000))
+def get_english_book():
+    return init_connection().open("English_Sentences")
+
+# ★ 증분 동기화 상태 (모든 세션이 공유) - 시트별 원본 행/지문을 보관
+# 프로세스 시작 시 로컬 스냅샷이 있으면 그것으로 채워 두고, 시트 동기화는 백그라운드에서 진행
+@st.cache_resource
+def _english_sync_state():
+    state = sheet_sync.new_sync_state()
+    state["lock"] = threading.Lock()        # 데이터 읽기/바꿔 끼우기 (짧게만 잡는다)
+    state["sync_lock"] = threading.Lock()   # 시트 조회는 한 번에 하나 (쓰기는 이것을 기다리지 않는다)
+    state["refreshing"] = False
+    state["from_snapshot"] = False
+    snap = snapshot_store.load("english")
+    if snap:
+        sheet_sync.restore_state(state, snap[0])
+        state["from_snapshot"] = True
+    return state
+
+def request_full_sync():
+    state = _english_sync_state()
+    state["force_full"] = True
+    state["stale"] = True
+
+# ★ 시트 동기화는 잠금 밖에서 작업본으로 - 잠금은 작업본을 뜰 때와 결과를 바꿔 끼울 때만 잡는다
+# 그 사이 쓰기(write-through)로 버전이 바뀌었으면 결과를 버린다 (다음 확인에서 다시 대조)
+def _sync_english(state):
+    with state["lock"]:
+        work, base, forced = sheet_sync.copy_state(state), state["version"], state["force_full"]
+    changed = sheet_sync.sync_english_book(get_english_book(), work)
+    with state["lock"]:
+        if state["version"] != base:
+            print("동기화 중 쓰기가 있어 결과를 버림")
+            return
+        again = state["force_full"] and not forced   # 조회 도중 들어온 전체 대조 요청은 남겨 둔다
+        sheet_sync.adopt_state(state, work)
+        state["force_full"] |= again
+        payload = sheet_sync.export_state(state) if changed else None
+    if payload: snapshot_store.save("english", payload)
+    state["from_snapshot"] = False
+    english_search_index(state["df"]) # 데이터가 바뀌었으면 검색/분류/정렬 색인도 미리 만들어 둔다
+    english_category_index(state["df"])
+    english_sort_index(state["df"])
+
+# ★ 데이터 버전에 묶인 파생 색인 - 버전이 같으면 재사용, 다르면 새로 만든다 (쓰기는 apply_english_write 에서 증분 반영)
+def _english_derived(name, df, build):
+    state = _english_sync_state()
+    version = df.attrs.get("version")
+    obj = state["derived"].get(name)
+    if obj is None or obj.version != version:
+        perf.count("index build: " + name)
+        obj = build(df)
+        if version == state["version"]: state["derived"][name] = obj
+    return obj
+
+def english_search_index(df):
+    return _english_derived("search", df, lambda d: text_index.NgramIndex(d, ['단어-문장', '해석', '분류']))
+
+def english_category_index(df):
+    return _english_derived("category", df, view_index.CategoryIndex)
+
+def english_sort_index(df):
+    return _english_derived("sort", df, view_index.SortIndex)
+
+# ★ 학습 모드용 분류별 JSON 조각 - 데이터 버전마다 한 번 (cache_resource 라 매 요청 복사 없음)
+@perf.cached(st.cache_resource(max_entries=2, show_spinner=False))
+def study_slices(version, _df):
+    return custom_components.study_slices(_df, english_category_index(_df))
+
+# ★ 브라우저 페이지 모드(?list=client)용 목록 전체 JSON - (데이터 버전, 필터 서명) 별로 한 번만 만든다
+@perf.cached(st.cache_data(max_entries=8, show_spinner=False))
+def english_list_payload(version, sig, _frame, _rank):
+    return custom_components.list_payload(_frame, _rank)
+
+# ★ 백그라운드 갱신 (한 번에 하나만) - 끝나면 해당 캐시 함수만 비워 다음 rerun 때 새 데이터가 보이게 한다
+# 여러 세션이 동시에 불러도 state["refreshing"] 으로 하나만 돈다. 새 프레임은 state["df"] 대입 한 번으로 바뀐다
+def _start_background_refresh(state, refresh, cached_fn):
+    with state["lock"]:
+        if state["refreshing"]: return
+        state["refreshing"] = True
+        state["tried_at"] = time.time()
+    def run():
+        try:
+            with state["sync_lock"]:
+                refresh(state)
+            state["stale"] = False
+            cached_fn.clear()
+        except Exception as e:
+            print(f"백그라운드 갱신 실패: {e}")
+        finally:
+            state["refreshing"] = False
+    threading.Thread(target=run, daemon=True).start()
+
+# ★ stale-while-revalidate - 보여줄 데이터가 있으면 TTL 이 다 돼도 기다리지 않고 그대로 보여 주고,
+# 만료 REFRESH_AHEAD 초 전부터는 (또는 갱신 요청/스냅샷 기동 시) 백그라운드 갱신을 미리 시작한다
+DATA_TTL = 600
+REFRESH_AHEAD = 60
+REFRESH_RETRY = 30   # 백그라운드 갱신이 실패했을 때 다음 시도까지 간격
+
+def _revalidate(state, stamp, refresh, cached_fn):
+    now = time.time()
+    due = state.get("stale") or state["from_snapshot"] or now - state[stamp] > DATA_TTL - REFRESH_AHEAD
+    if due and now - state.get("tried_at", 0.0) > REFRESH_RETRY:
+        _start_background_refresh(state, refresh, cached_fn)
+
+def revalidate_english():
+    _revalidate(_english_sync_state(), "checked_at", _sync_english, _english_frame)
+
+def revalidate_links():
+    _revalidate(_links_state(), "fetched_at", _fetch_links, _links_frame)
+
+# ★ 캐시 적중 때 복사 없음 - st.cache_data 는 적중할 때마다 프레임을 unpickle 해 새로 만든다 (10만 행이면 수십 MB)
+# 프레임은 cache_resource 로 한 벌만 두고, 호출자에게는 얕은 복사를 준다 (pandas Copy-on-Write → 고쳐도 공유 원본은 그대로)
+@perf.cached(st.cache_resource(ttl=DATA_TTL, show_spinner=False))
+def _english_frame():
+    state = _english_sync_state()
+    if state["version"] is not None:
+        revalidate_english()
+        return state["df"]
+    with state["sync_lock"]: # 처음 한 번 (스냅샷도 없을 때) 만 기다린다
+        if state["version"] is None: _sync_english(state)
+        return state["df"]
 
-@st.cache_data(ttl=600)
 def get_english_data_v7():
-    wb = init_connection().open("English_Sentences")
-    all_sheets = wb.worksheets()
-    
-    sheet_names = [ws.title for ws in all_sheets if ws.title != "링크" and "임시" not in ws.title]
-    
-    dfs = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=min(5, len(sheet_names))) as executor:
-        # lambda 대신 직접 함수 참조로 클로저 문제 방지
-        futures = {executor.submit(_fetch_sheet_concurrently, wb, name): name for name in sheet_names}
-        for future in concurrent.futures.as_completed(futures):
-            try:
-                res = future.result()
-                if not res.empty:
-                    dfs.append(res)
-            except Exception:
-                pass
-    
-    if not dfs:
-        return pd.DataFrame(columns=['분류', '단어-문장', '해석', '발음', '메모1', '메모2', 'sheet_idx', 'row_idx'])
-    return pd.concat(dfs, ignore_index=True)
+    return _english_frame().copy(deep=False)
 
 def get_links_sheet():
-    return init_connection().open("English_Sentences").worksheet("링크")
-
-@st.cache_data(ttl=600)
-def get_links_data_v6():
-    sheet = init_connection().open("English_Sentences").worksheet("링크")
+    return get_english_book().worksheet("링크")
+
+@st.cache_resource
+def _links_state():
+    state = {"rows": [], "df": None, "fetched_at": 0.0, "lock": threading.Lock(), "sync_lock": threading.Lock(), "refreshing": False, "from_snapshot": False, "derived": {}}
+    snap = snapshot_store.load("links")
+    if snap:
+        state["rows"] = snap[0]["rows"]
+        state["df"] = sheet_sync.links_frame(state["rows"])
+        state["fetched_at"] = snap[0]["fetched_at"]
+        state["from_snapshot"] = True
+    return state
+
+def request_links_reload():
+    _links_state()["stale"] = True
+
+def _fetch_links(state):
+    # 조회/재시도는 잠금 밖에서, 결과는 잠금 안에서 바꿔 끼운다 (그 사이 쓰기로 데이터가 바뀌었으면 버린다)
+    with state["lock"]:
+        base = state["df"]
+    sheet = get_links_sheet()
     for _ in range(3):
         try:
             data = sheet.get_all_values()
-            if not data: return pd.DataFrame(columns=['대분류', '소분류', '제목', '메모', '링크', 'row_idx'])
-            rows = [row + [""] * (5 - len(row)) for row in data[1:]]
-            df = pd.DataFrame(rows, columns=['대분류', '소분류', '제목', '메모', '링크'])
-            for col in df.columns: df[col] = df[col].astype(str).str.strip()
-            df['row_idx'] = df.index + 2
-            return df.sort_values(by='row_idx', ascending=True)
+            break
         except: time.sleep(1)
-    raise Exception("링크 데이터 로드 실패")
+    else:
+        raise Exception("링크 데이터 로드 실패")
+    rows = sheet_sync.normalize_rows(data[1:], 5) if data else []
+    df = sheet_sync.links_frame(rows)
+    with state["lock"]:
+        if state["df"] is not base:
+            print("링크 조회 중 쓰기가 있어 결과를 버림")
+            return state["df"]
+        state["rows"], state["df"] = rows, df
+        state["fetched_at"] = time.time()
+        state["from_snapshot"] = False
+    snapshot_store.save("links", {"rows": rows, "fetched_at": state["fetched_at"]})
+    links_search_index(df) # 검색/중복 URL 색인도 미리 만들어 둔다
+    links_url_index(df)
+    return df
+
+# ★ 링크 데이터 버전에 묶인 파생 색인 - 검색은 n-gram 색인, 새 링크 저장 전 중복 URL 은 해시 조회 한 번
+def _links_derived(name, df, build):
+    state = _links_state()
+    version = df.attrs.get("version")
+    obj = state["derived"].get(name)
+    if obj is None or obj.version != version:
+        perf.count("index build: links " + name)
+        obj = build(df)
+        if state["df"] is not None and version == state["df"].attrs.get("version"): state["derived"][name] = obj
+    return obj
+
+def links_search_index(df):
+    return _links_derived("search", df, lambda d: text_index.NgramIndex(d, ['제목', '메모', '링크']))
+
+def links_url_index(df):
+    return _links_derived("url", df, link_index.UrlIndex)
+
+# 영어 프레임과 같은 방식 - cache_resource 로 한 벌만 두고 얕은 복사를 준다 (백그라운드 갱신은 페이지에서 revalidate_links 로 건다)
+@perf.cached(st.cache_resource(ttl=DATA_TTL, show_spinner=False))
+def _links_frame():
+    state = _links_state()
+    if state["df"] is not None: return state["df"]
+    with state["sync_lock"]:
+        if state["df"] is not None: return state["df"]
+        return _fetch_links(state)
+
+def get_links_data_v6():
+    return _links_frame().copy(deep=False)
+
+# ★ "데이터 기준 시각" 표시 + 백그라운드 갱신이 끝나면 화면을 자동으로 다시 그림
+def data_as_of_label(state, as_of):
+    if not as_of: return ""
+    label = "🕒 " + datetime.fromtimestamp(as_of, timezone(timedelta(hours=9))).strftime("%m/%d %H:%M") + " 기준"
+    return label + (" · 🔄 동기화 중" if state["refreshing"] else "")
+
+@st.fragment(run_every=2)
+def _wait_for_background_refresh(state):
+    if not state["refreshing"]:
+        st.rerun()
+
+# ★ 쓰기 직후 캐시 직접 반영 - st.cache_data.clear() 로 전부 날리고 재조회하는 대신 바뀐 행만 고친다
+def _clear_derived_caches():
+    convert_df_to_csv.clear()
+    generate_print_html.clear()
+
+DERIVED_PATCH_MAX = 200   # 변경이 이보다 많으면 (일괄 등록 등) 파생 색인은 증분 대신 다음 사용 때 새로 만든다
+
+def _apply_english_patch(patch):
+    state = _english_sync_state()
+    with state["lock"]:
+        old_version = state["version"]
+        ops = patch(state)
+        renamed, state["renamed"] = state["renamed"], []
+        # 파생 색인은 복사본에 반영해 참조만 바꿔 끼운다 (읽는 세션은 잠금 없이 옛 색인 또는 새 색인 하나를 통째로 본다)
+        for name, obj in list(state["derived"].items()):
+            if ops is not None and len(ops) <= DERIVED_PATCH_MAX and obj.version == old_version: state["derived"][name] = obj.patched(ops, state["df"])
+            else: del state["derived"][name]
+    # 드라이브 수정시각은 여기서 받아들이지 않는다 - 우리 쓰기와 같은 주기에 들어온 다른 사람의 수정까지 "이미 본 것" 으로 덮게 된다.
+    # 다음 TTL 확인이 시각 변화를 보고 전체 대조 (우리 변경은 이미 반영돼 있어 지문이 같은 시트는 프레임을 다시 만들지 않는다)
+    _english_frame.clear()
+    _clear_derived_caches()
+    _save_english_snapshot_later(state)
+    if renamed: # 고친 행은 uid 가 바뀐다 → 복습 기록도 새 uid 로
+        reg = _review_registry()
+        with reg["lock"]:
+            review_scheduler.rename_uids(reg, renamed)
+
+SNAPSHOT_SAVE_DELAY = 5   # 쓰기 반영 뒤 스냅샷 저장을 이만큼 미룬다 → 연달아 쓰면 (행 수정 여러 번, 시트별 편집 저장) 한 번만 저장
+
+def _save_english_snapshot_later(state):
+    # 쓰기 반영분도 스냅샷에 남긴다 (안 그러면 재시작 때 다음 시트 동기화 전까지 옛 스냅샷이 보인다)
+    with state["lock"]:
+        if state.get("save_pending"): return
+        state["save_pending"] = True
+    def run():
+        with state["lock"]:
+            state["save_pending"] = False
+            payload = sheet_sync.export_state(state)
+        snapshot_store.save("english", payload)
+    threading.Timer(SNAPSHOT_SAVE_DELAY, run).start()
+
+def apply_english_write(sheet_name, op, row_idx, values=None):
+    _apply_english_patch(lambda state: sheet_sync.patch_english(state, sheet_name, op, row_idx, values))
+
+def apply_english_append(sheet_name, row_idx, rows):
+    _apply_english_patch(lambda state: sheet_sync.append_english(state, sheet_name, row_idx, rows))
+
+# ★ 표 편집 저장 - 시트마다 values batch_update 한 번 + 모든 삭제는 deleteDimension 묶음 batch_update 한 번
+# 행 번호는 모두 편집 전 기준: 수정을 먼저 보내고, 삭제는 아래 행부터 (연속 행은 한 구간으로) 지운다
+def flush_english_edits(wb, changes):
+    sheets = {w.title: w for w in wb.worksheets()}
+    for sheet_name, ch in changes.items():
+        if ch["update"]:
+            sheets[sheet_name].batch_update([{"range": f"A{r}:F{r}", "values": [v]} for r, v in sorted(ch["update"].items())])
+    requests = []
+    for sheet_name, ch in changes.items():
+        runs = []
+        for r in sorted(set(ch["delete"]), reverse=True):
+            if runs and runs[-1][0] == r + 1: runs[-1][0] = r
+            else: runs.append([r, r])
+        requests += [{"deleteDimension": {"range": {"sheetId": sheets[sheet_name].id, "dimension": "ROWS", "startIndex": a - 1, "endIndex": b}}} for a, b in runs]
+    if requests: wb.batch_update({"requests": requests})
+    for sheet_name, ch in changes.items():
+        _apply_english_patch(lambda state, s=sheet_name, c=ch: sheet_sync.edit_english(state, s, c["update"], c["delete"]))
+
+# ★ uid → 행 위치 해시 색인 - 데이터 버전마다 한 번 (랜덤 10 은 rerun 마다 uid 10개를 여기서 찾는다)
+@st.cache_resource(max_entries=2, show_spinner=False)
+def english_uid_index(version, _df):
+    return pd.Index(_df['uid'])
+
+# ★ 일괄 등록 중복 검사용 키 집합 - 데이터 버전마다 한 번
+@st.cache_resource(max_entries=1, show_spinner=False)
+def english_dedupe_keys(version, _df):
+    return frozenset(_df['단어-문장'].astype(str).map(bulk_import.dedupe_key))
+
+# ★ 전체 XLSX 내보내기 - download_button 의 callable 로 넘겨 버튼을 누를 때만 만든다 (별도 스레드, st.* 호출 불가)
+# 시트를 다시 읽지 않고 캐시된 원본 행(영어 탭들 + 링크)을 그대로 쓴다
+def build_full_xlsx(eng_state, links_state):
+    # 다운로드 때 백그라운드 갱신/쓰기와 겹칠 수 있다 → 잠금 안에서 탭별 행 목록만 집어 둔다
+    # (쓰기는 행 목록을 고치지 않고 새 목록으로 바꿔 끼우므로, 집어 둔 목록은 잠금 밖에서 그대로 써도 된다)
+    with eng_state["lock"]:
+        tabs = [(t, sheet_sync.ENG_COLS, eng_state["sheets"][t]["rows"]) for t in eng_state["order"] if t in eng_state["sheets"]]
+    if links_state["df"] is None:
+        with links_state["sync_lock"]:
+            if links_state["df"] is None: _fetch_links(links_state)
+    with links_state["lock"]:
+        tabs.append(("링크", sheet_sync.LINK_COLS, links_state["rows"]))
+    return xlsx_export.build_xlsx(tabs)
+
+def apply_links_write(op, row_idx, values=None):
+    state = _links_state()
+    with state["lock"]:
+        if state["df"] is None:
+            state["fetched_at"] = 0.0
+        else:
+            state["rows"] = sheet_sync.patch_rows(state["rows"], op, row_idx, values, width=5)
+            state["df"] = sheet_sync.links_frame(state["rows"])
+    _links_frame.clear()
+    _clear_derived_caches()
 
 
 # ==============================================================
@@ -462,23 +556,35 @@ if st.query_params.get("study") == "true":
     
     try:
         df = get_english_data_v7()
-        unique_cats = sorted([x for x in df['분류'].unique().tolist() if x != ''])
+        unique_cats = english_category_index(df).cats
         cat_param = st.query_params.get("cat", "ALL")
         initial_cat = "ALL" if cat_param in ["🔀 랜덤 10", "전체 분류", "ALL"] else cat_param
         
-        study_df = df[['분류', '단어-문장', '해석', '발음', '메모1', '메모2']].rename(
-            columns={'분류':'cat', '단어-문장': 'en', '해석': 'ko', '발음': 'pron', '메모1': 'memo1', '메모2': 'memo2'}
-        )
-        study_data = study_df.to_dict('records')
+        version = df.attrs.get("version")
+        with perf.phase("study payload"):
+            study = study_slices(version, df)
         
-        if not study_data:
+        if not study["counts"]:
             st.error("데이터가 없습니다. 창을 닫아주세요.")
         else:
-            render_study_mode(study_data, unique_cats, initial_cat)
+            want = st.session_state.pop("study_want", None) or []
+            if st.session_state.get("study_version") != version:
+                st.session_state.study_version = version
+                # 브라우저에 캐시가 있으면 (study_cache 쿠키) 지문만 보내고, 없거나 바뀐 분류는 브라우저가 요청한다
+                if st.context.cookies.get("study_cache") != "1":
+                    want = want + custom_components.study_first_cats(study["counts"], initial_cat)
+            slices = {c: study["slices"][c] for c in dict.fromkeys(want) if c in study["slices"]}
+            review = None
+            ev = st.session_state.pop("study_review", None)
+            if ev:
+                with perf.phase("review"):
+                    review = review_batch(df, version, ev)
+            custom_components.study_mode(unique_cats, study, initial_cat, version, slices, key="study", on_change=handle_study_event, review=review)
             
     except Exception as e:
         st.error(f"데이터 로드 실패: {e}")
         
+    perf.finish()
     st.stop() # 새창 모드일 때는 아래의 기본 앱을 실행하지 않음
 
 
@@ -696,7 +802,10 @@ if st.session_state.is_simple:
 # --- [다이얼로그 설정 (영어 단어장)] ---
 @st.dialog("✨ 새 항목 추가")
 def add_dialog(unique_cats, available_sheets):
-    with st.form("add_form", clear_on_submit=True):
+    tab_one, tab_bulk = st.tabs(["✏️ 한 건 추가", "📥 일괄 등록"])
+    with tab_bulk:
+        bulk_import_form(unique_cats, available_sheets)
+    with tab_one, st.form("add_form", clear_on_submit=True):
         st.markdown("<p style='font-size: 1.1rem; font-weight: bold; margin-bottom: 5px; color: #FFD700;'>1. 저장할 시트</p>", unsafe_allow_html=True)
         # ★ 구글 시트에서 자동으로 가져온 시트 이름들을 선택 옵션으로 제공합니다!
         target_sheet_name = st.radio("저장할 시트", available_sheets, horizontal=True, label_visibility="collapsed")
@@ -718,20 +827,106 @@ def add_dialog(unique_cats, available_sheets):
         if st.form_submit_button("💾 저장하기", use_container_width=True, type="primary"):
             final_cat = new_cat.strip() if new_cat.strip() else (selected_cat if selected_cat != "(새로 입력)" else "")
             if word_sent:
-                wb = init_connection().open("English_Sentences")
+                wb = get_english_book()
                 target_sheet = wb.worksheet(target_sheet_name)
-                target_sheet.append_row([final_cat, word_sent, mean, pron, m1, m2])
+                new_row = [final_cat, word_sent, mean, pron, m1, m2]
+                res = target_sheet.append_row(new_row)
+                apply_english_write(target_sheet_name, "append", sheet_sync.appended_row_idx(res), new_row) # 캐시에 바로 반영 (전체 재조회 없음)
                 st.success("저장 완료!")
                 time.sleep(1)
-                st.cache_data.clear() # 강제 캐시 초기화
                 st.rerun()
                 
     if st.button("❌ 창 닫기 (취소)", use_container_width=True):
         st.rerun()
 
+# ★ 일괄 등록 - CSV / XLSX 파일이나 붙여넣은 TSV 를 검사·중복 제거한 뒤 시트마다 append_rows 한 번으로 저장
+# (1,000 문장이어도 API 호출은 시트 수 × 2 + 수정시각 확인 1회), 저장 후 캐시는 재조회 없이 바로 반영
+def bulk_import_form(unique_cats, available_sheets):
+    st.caption("열 순서: 분류, 단어-문장, 해석, 발음, 메모1, 메모2 (첫 줄이 헤더면 이름으로 맞춤 · '시트' 열로 행마다 저장 시트 지정 가능)")
+    src = st.radio("입력 방식", ["파일 (CSV / XLSX / TSV)", "붙여넣기 (엑셀에서 복사)"], horizontal=True, key="bulk_src")
+    rows = None
+    try:
+        if src.startswith("파일"):
+            up = st.file_uploader("파일 선택", type=["csv", "tsv", "txt", "xlsx"], key="bulk_file")
+            if up is not None: rows = bulk_import.read_rows(up.name, up.getvalue())
+        else:
+            pasted = st.text_area("여기에 붙여넣기 (탭 구분)", height=160, key="bulk_text")
+            if pasted.strip(): rows = bulk_import.read_rows(text=pasted)
+    except ValueError as e:
+        st.error(str(e))
+    c1, c2 = st.columns(2)
+    default_sheet = c1.selectbox("기본 저장 시트", available_sheets, key="bulk_sheet")
+    default_cat = c2.selectbox("분류가 빈 행에 넣을 분류", [""] + unique_cats, key="bulk_cat")
+    if not rows: return
+
+    df = _english_sync_state()["df"]
+    saved_keys = st.session_state.setdefault("bulk_saved_keys", set())   # 도중에 실패한 저장에서 이미 들어간 행 → 다시 저장하지 않도록 중복 처리
+    try:
+        plan = bulk_import.prepare(rows, english_dedupe_keys(df.attrs.get("version"), df) | saved_keys, default_sheet, available_sheets, default_cat)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    total = len(plan["preview"])
+    m = st.columns(3)
+    m[0].metric("새로 등록", total)
+    m[1].metric("중복 (건너뜀)", plan["dup"])
+    m[2].metric("오류", len(plan["invalid"]))
+    if plan["invalid"]:
+        with st.expander("⚠️ 오류 행 보기"):
+            st.dataframe(pd.DataFrame(plan["invalid"], columns=["줄", "사유"]), hide_index=True, use_container_width=True)
+    if total:
+        st.dataframe(plan["preview"].head(100), hide_index=True, use_container_width=True)
+    if st.button(f"💾 {total}건 일괄 저장", type="primary", use_container_width=True, disabled=total == 0, key="bulk_save"):
+        saved, failed = [], None
+        with st.spinner("저장 중..."):
+            for sheet_name, batch in plan["batches"].items():
+                try:
+                    res = get_english_book().worksheet(sheet_name).append_rows(batch)
+                except Exception as e:
+                    failed = (sheet_name, e)
+                    break
+                saved.append((sheet_name, len(batch)))
+                saved_keys.update(bulk_import.dedupe_key(v[1]) for v in batch)
+                try:
+                    apply_english_append(sheet_name, sheet_sync.appended_row_idx(res), batch) # 캐시에 바로 반영 (전체 재조회 없음)
+                except Exception:
+                    request_full_sync()   # 시트에는 들어갔다 → 캐시는 다음 전체 대조로 맞춘다
+        if failed:
+            done = ", ".join(f"{s} {n}건" for s, n in saved) or "없음"
+            st.error(f"'{failed[0]}' 시트 저장 실패: {failed[1]}\n\n저장된 시트: {done} · 남은 {total - sum(n for _, n in saved)}건은 다시 저장을 누르면 이어서 저장됩니다.")
+            return
+        st.session_state.pop("bulk_saved_keys", None)
+        st.success(f"{total}건 저장 완료!")
+        time.sleep(1)
+        st.rerun()
+
+# ★ 표 편집 모드 - 현재 필터 결과를 st.data_editor 로 한꺼번에 고치고 바뀐 셀만 골라 한 번에 저장
+EDIT_GRID_MAX = 2000
+
+def bulk_edit_grid(d_df, version, view_sig):
+    if len(d_df) > EDIT_GRID_MAX:
+        st.info(f"표 편집은 {EDIT_GRID_MAX}행까지 가능합니다. 분류나 검색으로 범위를 좁혀 주세요 (현재 {len(d_df)}행).")
+        return
+    before = d_df[sheet_sync.ENG_FRAME_COLS].astype({c: str for c in sheet_sync.CATEGORY_COLS}).set_index('uid') # category 열이면 표에서 기존 분류만 고를 수 있다
+    # 데이터 버전/필터가 바뀌면 편집 내용도 새로 시작 (이전 행 번호로 저장하지 않도록)
+    after = st.data_editor(before, num_rows="delete", hide_index=True, disabled=['sheet_idx', 'row_idx'], use_container_width=True,
+                           column_config={"sheet_idx": "시트", "row_idx": "행"}, key=f"bulk_edit_{version}_{hash(view_sig)}")
+    changes, cells = sheet_sync.edit_diff(before, after)
+    n_upd = sum(len(c["update"]) for c in changes.values()); n_del = sum(len(c["delete"]) for c in changes.values())
+    c1, c2 = st.columns([3, 1], vertical_alignment="center")
+    c1.caption(f"수정 {n_upd}행 ({cells}칸) · 삭제 {n_del}행")
+    if c2.button("💾 변경 내용 저장", type="primary", use_container_width=True, disabled=not changes, key="bulk_edit_save"):
+        if _english_sync_state()["version"] != version:
+            st.error("그 사이 데이터가 바뀌었습니다. 화면을 새로 고친 뒤 다시 편집해 주세요.")
+            return
+        with st.spinner("저장 중..."):
+            flush_english_edits(get_english_book(), changes)
+        st.rerun()
+
 @st.dialog("✏️ 항목 수정 및 삭제")
 def edit_dialog(row_idx, sheet_idx, row_data, unique_cats):
-    del_key = f"confirm_del_{sheet_idx}_{row_idx}"
+    key = row_data.get('uid', f"{sheet_idx}_{row_idx}")   # 위젯/확인 상태는 uid 로 - 쓰기로 행 번호가 밀려도 다른 행의 상태를 물려받지 않는다
+    del_key = f"confirm_del_{key}"
     if del_key not in st.session_state:
         st.session_state[del_key] = False
 
@@ -740,7 +935,7 @@ def edit_dialog(row_idx, sheet_idx, row_data, unique_cats):
         cat_val = row_data.get('분류', '')
         cat_index = safe_cats.index(cat_val) if cat_val in safe_cats else 0
         
-        with st.form(f"edit_{sheet_idx}_{row_idx}"):
+        with st.form(f"edit_{key}"):
             st.markdown("<p style='font-size: 1.1rem; font-weight: bold; margin-bottom: 5px; color: #FFD700;'>1. 카테고리 수정</p>", unsafe_allow_html=True)
             edit_cat = st.selectbox("기존 분류 선택", safe_cats, index=cat_index)
             new_cat = st.text_input("분류 직접 변경", value="")
@@ -757,11 +952,17 @@ def edit_dialog(row_idx, sheet_idx, row_data, unique_cats):
             st.markdown("<br>", unsafe_allow_html=True)
             if st.form_submit_button("💾 수정한 내용 저장", use_container_width=True, type="primary"):
                 final_cat = new_cat.strip() if new_cat.strip() else edit_cat
-                wb = init_connection().open("English_Sentences")
-                target_sheet = wb.worksheet(sheet_idx) if isinstance(sheet_idx, str) else wb.get_worksheet(sheet_idx)
-                target_sheet.update(f"A{row_idx}:F{row_idx}", [[final_cat, word_sent, mean, pron, m1, m2]])
-                st.cache_data.clear() # 강제 캐시 초기화
-                st.rerun()
+                cur_idx = current_row_idx(_english_sync_state()["df"], row_data.get('uid'), row_idx)
+                if cur_idx is None:
+                    st.error("창을 연 사이 다른 곳에서 수정되었거나 삭제된 항목입니다. 창을 닫고 다시 열어 주세요.")
+                else:
+                    wb = get_english_book()
+                    target_sheet = wb.worksheet(sheet_idx) if isinstance(sheet_idx, str) else wb.get_worksheet(sheet_idx)
+                    new_row = [final_cat, word_sent, mean, pron, m1, m2]
+                    target_sheet.update(f"A{cur_idx}:F{cur_idx}", [new_row])
+                    apply_english_write(target_sheet.title, "update", cur_idx, new_row) # 캐시에 바로 반영
+                    follow_random_uid(row_data.get('uid'), target_sheet.title, cur_idx)
+                    st.rerun()
 
         st.markdown('<div class="delete-btn-wrapper"></div>', unsafe_allow_html=True)
         st.button("🗑️ 항목 삭제", use_container_width=True, on_click=set_state, args=(del_key, True))
@@ -777,16 +978,20 @@ def edit_dialog(row_idx, sheet_idx, row_data, unique_cats):
         with c1:
             st.markdown('<div class="delete-btn-wrapper"></div>', unsafe_allow_html=True)
             if st.button("✅ 네, 완전히 삭제합니다", use_container_width=True):
-                wb = init_connection().open("English_Sentences")
-                target_sheet = wb.worksheet(sheet_idx) if isinstance(sheet_idx, str) else wb.get_worksheet(sheet_idx)
-                target_sheet.delete_rows(row_idx)
+                cur_idx = current_row_idx(_english_sync_state()["df"], row_data.get('uid'), row_idx)
+                if cur_idx is not None: # 이미 없어진 행이면 지우지 않는다 (엉뚱한 행 삭제 방지)
+                    wb = get_english_book()
+                    target_sheet = wb.worksheet(sheet_idx) if isinstance(sheet_idx, str) else wb.get_worksheet(sheet_idx)
+                    target_sheet.delete_rows(cur_idx)
+                    apply_english_write(target_sheet.title, "delete", cur_idx) # 캐시에서 삭제 + 아래 행 번호 당김
                 st.session_state[del_key] = False
-                st.cache_data.clear() # 강제 캐시 초기화
                 st.rerun()
         with c2:
             st.button("아니오 (수정창으로 돌아가기)", use_container_width=True, on_click=set_state, args=(del_key, False))
 
 # --- [다이얼로그 설정 (링크 모음)] ---
+LINKS_PAGE_SIZE = 30   # 링크 목록 한 페이지 행 수
+
 @st.dialog("✨ 새 링크 추가")
 def add_link_dialog(unique_cats1, unique_cats2):
     with st.form("add_link_form", clear_on_submit=True):
@@ -809,21 +1014,45 @@ def add_link_dialog(unique_cats1, unique_cats2):
             final_cat2 = new_cat2.strip() if new_cat2.strip() else (selected_cat2 if selected_cat2 != "(새로 입력)" else "")
             
             if title and link_url:
-                sheet2 = get_links_sheet()
-                sheet2.append_row([final_cat1, final_cat2, title, memo, link_url])
-                st.success("새 링크 저장 완료!")
-                time.sleep(1)
-                st.cache_data.clear() # 강제 캐시 초기화
-                st.rerun()
+                new_row = [final_cat1, final_cat2, title, memo, link_url]
+                # 이미 있는 주소면 바로 저장하지 않고 확인을 받는다 (폼은 비워지므로 입력값은 세션에 보관)
+                links_df = _links_state()["df"]
+                if links_df is not None and links_url_index(links_df).find(link_url):
+                    st.session_state.link_dup = new_row
+                else:
+                    save_new_link(new_row)
             else:
                 st.error("제목과 링크 주소는 필수입니다.")
+
+    dup_row = st.session_state.get("link_dup")
+    if dup_row:
+        links_df = _links_state()["df"]
+        hits = links_df.iloc[links_url_index(links_df).find(dup_row[4])]
+        st.warning("⚠️ 이미 등록된 링크입니다:\n\n" + "\n".join(f"- {r['제목']} (행 {r['row_idx']})" for _, r in hits.iterrows()))
+        c1, c2 = st.columns(2)
+        if c1.button("그래도 저장", use_container_width=True):
+            del st.session_state.link_dup
+            save_new_link(dup_row)
+        if c2.button("저장 안 함", use_container_width=True):
+            del st.session_state.link_dup
+            st.rerun()
                 
     if st.button("❌ 창 닫기 (취소)", use_container_width=True):
+        st.session_state.pop("link_dup", None)
         st.rerun()
 
+def save_new_link(new_row):
+    sheet2 = get_links_sheet()
+    res = sheet2.append_row(new_row)
+    apply_links_write("append", sheet_sync.appended_row_idx(res), new_row) # 캐시에 바로 반영
+    st.success("새 링크 저장 완료!")
+    time.sleep(1)
+    st.rerun()
+
 @st.dialog("✏️ 링크 수정 및 삭제")
 def edit_link_dialog(row_idx, row_data, unique_cats1, unique_cats2):
-    del_key = f"confirm_del_link_{row_idx}"
+    key = row_data.get('uid', row_idx)
+    del_key = f"confirm_del_link_{key}"
     if del_key not in st.session_state:
         st.session_state[del_key] = False
 
@@ -836,7 +1065,7 @@ def edit_link_dialog(row_idx, row_data, unique_cats1, unique_cats2):
         cat2_val = row_data.get('소분류', '')
         cat2_index = safe_cats2.index(cat2_val) if cat2_val in safe_cats2 else 0
         
-        with st.form(f"edit_link_{row_idx}"):
+        with st.form(f"edit_link_{key}"):
             st.markdown("<p style='font-size: 1.1rem; font-weight: bold; margin-bottom: 5px; color: #FFD700;'>1. 카테고리 수정</p>", unsafe_allow_html=True)
             edit_cat1 = st.selectbox("대분류", safe_cats1, index=cat1_index)
             new_cat1 = st.text_input("대분류 직접 수정", value="") 
@@ -854,10 +1083,15 @@ def edit_link_dialog(row_idx, row_data, unique_cats1, unique_cats2):
             if st.form_submit_button("💾 수정한 내용 저장", use_container_width=True, type="primary"):
                 final_cat1 = new_cat1.strip() if new_cat1.strip() else edit_cat1
                 final_cat2 = new_cat2.strip() if new_cat2.strip() else edit_cat2
-                sheet2 = get_links_sheet()
-                sheet2.update(f"A{row_idx}:E{row_idx}", [[final_cat1, final_cat2, title, memo, link_url]])
-                st.cache_data.clear() # 강제 캐시 초기화
-                st.rerun()
+                cur_idx = current_row_idx(_links_state()["df"], row_data.get('uid'), row_idx)
+                if cur_idx is None:
+                    st.error("창을 연 사이 다른 곳에서 수정되었거나 삭제된 링크입니다. 창을 닫고 다시 열어 주세요.")
+                else:
+                    sheet2 = get_links_sheet()
+                    new_row = [final_cat1, final_cat2, title, memo, link_url]
+                    sheet2.update(f"A{cur_idx}:E{cur_idx}", [new_row])
+                    apply_links_write("update", cur_idx, new_row) # 캐시에 바로 반영
+                    st.rerun()
 
         st.markdown('<div class="delete-btn-wrapper"></div>', unsafe_allow_html=True)
         st.button("🗑️ 링크 삭제", use_container_width=True, on_click=set_state, args=(del_key, True))
@@ -873,10 +1107,12 @@ def edit_link_dialog(row_idx, row_data, unique_cats1, unique_cats2):
         with c1:
             st.markdown('<div class="delete-btn-wrapper"></div>', unsafe_allow_html=True)
             if st.button("✅ 네, 완전히 삭제합니다", use_container_width=True):
-                sheet2 = get_links_sheet()
-                sheet2.delete_rows(row_idx)
+                cur_idx = current_row_idx(_links_state()["df"], row_data.get('uid'), row_idx)
+                if cur_idx is not None:
+                    sheet2 = get_links_sheet()
+                    sheet2.delete_rows(cur_idx)
+                    apply_links_write("delete", cur_idx) # 캐시에서 삭제 + 아래 행 번호 당김
                 st.session_state[del_key] = False
-                st.cache_data.clear() # 강제 캐시 초기화
                 st.rerun()
         with c2:
             st.button("아니오 (수정창으로 돌아가기)", use_container_width=True, on_click=set_state, args=(del_key, False))
@@ -889,19 +1125,18 @@ def format_num_input():
 def clear_num_input():
     st.session_state.num_input = ""
 
-def num_to_eng(num):
-    if num == 0: return "zero"
-    ones = ["", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
-    tens = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
-    scales = ["", "thousand", "million", "billion", "trillion"]
-    def _convert(n):
-        if n < 20: return ones[n]
-        if n < 100: return tens[n // 10] + ("-" + ones[n % 10] if n % 10 != 0 else "")
-        if n < 1000: return ones[n // 100] + " hundred" + (" " + _convert(n % 100) if n % 100 != 0 else "")
-        for i in range(1, len(scales)):
-            if n < 1000 ** (i + 1): return _convert(n // (1000 ** i)) + " " + scales[i] + (" " + _convert(n % (1000 ** i)) if n % (1000 ** i) != 0 else "")
-        return str(n)
-    return _convert(num).strip()
+# ★ Num.ENG 일괄 변환 - 엑셀 열을 붙여넣으면 한 줄씩 (소수/달러/원 포함) 한 번에 변환
+@st.dialog("🔢 Num.ENG 일괄 변환", width="large")
+def num_batch_dialog():
+    text = st.text_area("금액 (한 줄에 하나 · 예: 1,234,567 / $12.30 / 12,000원 / 3.14)", height=200, key="num_batch_text")
+    rows = num_eng.convert_lines(text)
+    if not rows: return
+    out = pd.DataFrame([(src, eng.capitalize() if eng else "") for src, eng in rows], columns=["입력", "영어"])
+    bad = sum(1 for _, eng in rows if eng is None)
+    if bad: st.warning(f"⚠️ 읽을 수 없는 줄 {bad}개는 비워 두었습니다.")
+    st.dataframe(out, hide_index=True, use_container_width=True)
+    st.code("\n".join(out["영어"]), language=None) # 오른쪽 위 복사 버튼으로 한 번에 복사
+    st.download_button("📥 CSV 저장", data=out.to_csv(index=False).encode('utf-8-sig'), file_name=f"NumENG_{time.strftime('%Y%m%d')}.csv", use_container_width=True)
 
 # --- [메인 로직] ---
 
@@ -960,10 +1195,12 @@ else:
         if st.session_state.app_mode == 'English':
             if st.button("🔗 링크 모음으로 전환", use_container_width=True, type="secondary"):
                 st.session_state.app_mode = 'Links'
+                st.session_state.curr_p = 1
                 st.rerun()
         else:
             if st.button("영어 모음으로 전환", use_container_width=True, type="secondary"):
                 st.session_state.app_mode = 'English'
+                st.session_state.curr_p = 1
                 st.rerun()
                 
     with n_col2:
@@ -983,7 +1220,9 @@ else:
             st.markdown("<div style='height:1px;'></div>", unsafe_allow_html=True)
             
     with n_col3:
-        st.text_input("🔢 Num.ENG 변환기", key="num_input", on_change=format_num_input, label_visibility="collapsed", placeholder="숫자를 입력하면 영어로 변환됩니다...")
+        num_c1, num_c2 = st.columns([6, 1], vertical_alignment="center")
+        num_c1.text_input("🔢 Num.ENG 변환기", key="num_input", on_change=format_num_input, label_visibility="collapsed", placeholder="숫자를 입력하면 영어로 변환됩니다...")
+        if num_c2.button("📋", key="num_batch_btn", help="여러 금액 일괄 변환 (붙여넣기)", use_container_width=True): num_batch_dialog()
 
     with n_col4:
         if not st.session_state.authenticated:
@@ -999,8 +1238,12 @@ else:
 
     if st.session_state.num_input:
         clean_num = st.session_state.num_input.replace(",", "").strip()
-        if clean_num.isdigit():
-            eng_text = num_to_eng(int(clean_num)).capitalize()
+        eng_text = num_eng.num_to_eng(int(clean_num)) if clean_num.isdigit() else None
+        if eng_text:
+            eng_text = eng_text.capitalize()
+        elif clean_num.isdigit():   # decillion 을 넘는 수 → 읽기 대신 숫자 그대로
+            eng_text = f"{int(clean_num):,} <span style='font-size:0.9rem; opacity:0.7;'>(영어로 읽을 수 있는 범위를 넘는 수)</span>"
+        if eng_text:
             res_col1, res_col2 = st.columns([1, 1], vertical_alignment="center")
             with res_col1:
                 st.markdown(f"<div class='num-result'>{eng_text}</div>", unsafe_allow_html=True)
@@ -1079,9 +1322,12 @@ else:
     # ==============================================================
     if st.session_state.app_mode == 'English':
         try:
-            df = get_english_data_v7() 
+            with perf.phase("load"):
+                df = get_english_data_v7() 
+                revalidate_english() # 캐시 적중이어도 만료가 가까우면 백그라운드 갱신을 미리 건다
 
-            unique_cats = sorted([x for x in df['분류'].unique().tolist() if x != ''])
+            cat_index = english_category_index(df)
+            unique_cats = cat_index.cats
             
             available_sheets = df['sheet_idx'].unique().tolist() if not df.empty else ["메인"]
             
@@ -1089,37 +1335,42 @@ else:
             
             is_simple = st.session_state.is_simple
             search = st.session_state.active_search
-            if search: 
-                d_df = df[df['단어-문장'].str.contains(search, case=False, na=False) | df['해석'].str.contains(search, case=False, na=False) | df['분류'].str.contains(search, case=False, na=False)]
-            else:
-                if sel_cat == "🔀 랜덤 10":
-                    if st.session_state.current_cat != "🔀 랜덤 10" or 'random_df' not in st.session_state:
-                        st.session_state.random_df = df.sample(n=min(10, len(df)))
-                    d_df = st.session_state.random_df
-                elif sel_cat != "전체 분류": 
-                    d_df = df[df['분류'] == sel_cat]
+            # ★ 필터 결과는 행 위치(d_pos)로만 들고, 정렬은 버전별로 캐시된 순열에서 순위로 뽑는다 (None = 전체)
+            with perf.phase("filter"):
+                d_pos = None
+                if search: 
+                    d_pos = english_search_index(df).search(search)
                 else:
-                    d_df = df
-                st.session_state.current_cat = sel_cat
-
-            if st.session_state.sort_order == 'asc': 
-                d_df = d_df.sort_values(by='단어-문장', ascending=True, key=lambda col: col.str.lower())
-            elif st.session_state.sort_order == 'desc': 
-                d_df = d_df.sort_values(by='단어-문장', ascending=False, key=lambda col: col.str.lower())
-            else: 
-                if sel_cat != "🔀 랜덤 10":
-                    d_df = d_df.sort_values(by='row_idx', ascending=True)
+                    if sel_cat == "🔀 랜덤 10":
+                        # 행 복사본 대신 uid 만 들고 있다가 매번 현재 데이터에서 찾는다 → 쓰기/동기화 뒤에도 행 번호가 맞다
+                        uid_index = english_uid_index(df.attrs.get("version"), df)
+                        if st.session_state.current_cat != "🔀 랜덤 10" or 'random_uids' not in st.session_state:
+                            st.session_state.random_uids = pick_random_uids(df, cat_index, uid_index)
+                        d_pos = uid_index.get_indexer(st.session_state.random_uids)
+                        d_pos = d_pos[d_pos >= 0]
+                    elif sel_cat != "전체 분류": 
+                        d_pos = cat_index.positions(sel_cat)
+                    st.session_state.current_cat = sel_cat
+
+            sort_mode = st.session_state.sort_order
+            random_view = not search and sel_cat == "🔀 랜덤 10"
+            view_sig = (search, sel_cat, sort_mode, tuple(st.session_state.random_uids) if random_view else None)
+            if sort_mode not in ('asc', 'desc') and not random_view:
+                sort_mode = 'row' # 랜덤 10 은 뽑힌 순서 그대로
+            with perf.phase("sort"):
+                d_df = df.iloc[english_sort_index(df).order(d_pos, sort_mode)]
 
             st.markdown("<div style='background-color: rgba(0,0,0,0.25); padding: 15px 20px; border-radius: 15px; margin: 20px 0; border: 1px solid rgba(255,255,255,0.05);'>", unsafe_allow_html=True)
-            cb_cols = [2.5, 2, 1.5, 1.5, 1.2, 1.2] if st.session_state.authenticated else [3.5, 1.5, 1.5, 1.2, 1.2]
+            cb_cols = [2.5, 2, 1.5, 1.5, 1.2, 1.2, 1.2] if st.session_state.authenticated else [3.5, 1.5, 1.5, 1.2, 1.2, 1.2]
             cb = st.columns(cb_cols, vertical_alignment="center")
             
             cb[0].text_input("🔍 목록 내 검색", key="search_input", on_change=handle_search, label_visibility="collapsed")
             
             btn_idx = 2 if st.session_state.authenticated else 1
             csv_idx = 3 if st.session_state.authenticated else 2
-            prt_idx = 4 if st.session_state.authenticated else 3
-            sync_idx = 5 if st.session_state.authenticated else 4
+            xlsx_idx = csv_idx + 1
+            prt_idx = 5 if st.session_state.authenticated else 4
+            sync_idx = 6 if st.session_state.authenticated else 5
             
             if st.session_state.authenticated:
                 if cb[1].button("➕ 새 항목 추가", type="primary", use_container_width=True): add_dialog(unique_cats, available_sheets)
@@ -1128,50 +1379,81 @@ else:
             if cb[btn_idx].button(btn_text, type="primary" if not st.session_state.is_simple else "secondary", use_container_width=True):
                 st.session_state.is_simple = not st.session_state.is_simple; st.rerun()
 
-            cb[csv_idx].download_button("📥 CSV 추출", data=convert_df_to_csv(d_df), file_name=f"English_Data_{time.strftime('%Y%m%d')}.csv", use_container_width=True)
+            cb[csv_idx].download_button("📥 CSV 추출", data=convert_df_to_csv(d_df, view_key(d_df), view_sig), file_name=f"English_Data_{time.strftime('%Y%m%d')}.csv", use_container_width=True)
+            eng_state, links_state = _english_sync_state(), _links_state()
+            cb[xlsx_idx].download_button("📊 전체 XLSX", data=lambda: build_full_xlsx(eng_state, links_state), file_name=f"English_Sentences_{time.strftime('%Y%m%d')}.xlsx",
+                                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", on_click="ignore", use_container_width=True)
             
             if cb[prt_idx].button("🖨️ A4 인쇄", use_container_width=True):
                 with st.spinner("🖨️ 인쇄 미리보기를 준비 중입니다... (데이터가 많을 경우 수 초가 소요됩니다)"):
-                    print_table(d_df, "TOmBOy94 영어 단어장")
+                    print_table(d_df, "TOmBOy94 영어 단어장", view_sig)
                 
             if cb[sync_idx].button("🔄 갱신", use_container_width=True):
+                request_full_sync()
                 st.cache_data.clear()
                 st.rerun()
                 
             st.markdown("</div>", unsafe_allow_html=True)
 
             total = len(d_df); pages = ceil(total/30) if total > 0 else 1
+            use_grid = st.query_params.get("grid") != "off"
+            client_list = use_grid and st.query_params.get("list") == "client"
+            if client_list: pages = 1 # 페이지 이동은 브라우저에서 → 아래 페이지 버튼 생략
             curr_p = st.session_state.curr_p
             
-            st.markdown(f"<div style='display:flex; justify-content:flex-end; padding-right:10px;'><span style='color:#A3B8B8; font-weight:bold; font-size:1.0rem;'>{('🔍 검색: ' + search + ' | ') if search else ''}총 {total}개 (Page {curr_p}/{pages})</span></div>", unsafe_allow_html=True)
+            eng_state = _english_sync_state()
+            as_of = data_as_of_label(eng_state, eng_state["checked_at"])
+            st.markdown(f"<div style='display:flex; justify-content:flex-end; padding-right:10px;'><span style='color:#A3B8B8; font-weight:bold; font-size:1.0rem;'>{('🔍 검색: ' + search + ' | ') if search else ''}총 {total}개{'' if client_list else f' (Page {curr_p}/{pages})'}{(' | ' + as_of) if as_of else ''}</span></div>", unsafe_allow_html=True)
+            if eng_state["refreshing"]: _wait_for_background_refresh(eng_state)
             
-            ratio = [1.5, 6, 4.5, 1.2] if is_simple else [1.2, 4, 2.5, 2, 2.5, 2.5, 1.2]
-            labels = ["분류", "단어-문장", "해석", "수정"] if is_simple else ["분류", "단어-문장", "해석", "발음", "메모1", "메모2", "수정"]
-            h_cols = st.columns(ratio if st.session_state.authenticated else ratio[:-1], vertical_alignment="center")
-            for i, l in enumerate(labels if st.session_state.authenticated else labels[:-1]):
-                if l == "단어-문장":
-                    sort_icon = " ↑" if st.session_state.sort_order == 'asc' else (" ↓" if st.session_state.sort_order == 'desc' else "")
-                    if h_cols[i].button(f"{l}{sort_icon}", key="sort_btn"):
-                        st.session_state.sort_order = 'asc' if st.session_state.sort_order == 'None' else ('desc' if st.session_state.sort_order == 'asc' else 'None')
-                        st.rerun()
-                else: h_cols[i].markdown(f"<span class='header-label'>{l}</span>", unsafe_allow_html=True)
+            bulk_edit = st.session_state.authenticated and st.toggle("📝 표 편집 모드 (현재 목록을 한꺼번에 수정/삭제)", key="bulk_edit")
+            if bulk_edit: pages = 1 # 표 편집은 필터 결과 전체를 한 표로
+            page_df = d_df.iloc[(curr_p-1)*30 : curr_p*30]
+            perf.count("rows rendered", 0 if bulk_edit or client_list else len(page_df))
+            if bulk_edit:
+                bulk_edit_grid(d_df, df.attrs.get("version"), view_sig)
+            elif client_list:
+                rank = english_sort_index(df).rank_asc[d_df.index.to_numpy()]
+                data, encoding = english_list_payload(df.attrs.get("version"), view_sig, d_df, rank)
+                data_key = f"{df.attrs.get('version')}:{hash(view_sig)}"
+                custom_components.english_grid(None, is_simple, st.session_state.authenticated, st.session_state.sort_order, key="eng_grid", on_change=handle_grid_event, data=data, encoding=encoding, data_key=data_key)
+            elif use_grid:
+                custom_components.english_grid(page_df, is_simple, st.session_state.authenticated, st.session_state.sort_order, key="eng_grid", on_change=handle_grid_event)
+            if use_grid:
+                pending = st.session_state.pop("grid_edit", None)
+                if pending and st.session_state.authenticated:
+                    hit = find_rows(df, [pending[2]]) if pending[2] else df[(df['sheet_idx'] == pending[0]) & (df['row_idx'] == pending[1])]
+                    if hit.empty: st.toast("그 사이 수정되었거나 삭제된 항목입니다.")
+                    else: edit_dialog(int(hit['row_idx'].iat[0]), hit['sheet_idx'].iat[0], hit.iloc[0].to_dict(), unique_cats)
+            elif not bulk_edit:
+                # ?grid=off → 이전 방식 (행마다 st.columns)
+                ratio = [1.5, 6, 4.5, 1.2] if is_simple else [1.2, 4, 2.5, 2, 2.5, 2.5, 1.2]
+                labels = ["분류", "단어-문장", "해석", "수정"] if is_simple else ["분류", "단어-문장", "해석", "발음", "메모1", "메모2", "수정"]
+                h_cols = st.columns(ratio if st.session_state.authenticated else ratio[:-1], vertical_alignment="center")
+                for i, l in enumerate(labels if st.session_state.authenticated else labels[:-1]):
+                    if l == "단어-문장":
+                        sort_icon = " ↑" if st.session_state.sort_order == 'asc' else (" ↓" if st.session_state.sort_order == 'desc' else "")
+                        if h_cols[i].button(f"{l}{sort_icon}", key="sort_btn"):
+                            cycle_sort_order()
+                            st.rerun()
+                    else: h_cols[i].markdown(f"<span class='header-label'>{l}</span>", unsafe_allow_html=True)
             
-            st.markdown("<div style='border-bottom:2px solid rgba(255,255,255,0.2); margin-top:-15px; margin-bottom:10px;'></div>", unsafe_allow_html=True)
+                st.markdown("<div style='border-bottom:2px solid rgba(255,255,255,0.2); margin-top:-15px; margin-bottom:10px;'></div>", unsafe_allow_html=True)
 
-            for idx, row in d_df.iloc[(curr_p-1)*30 : curr_p*30].iterrows():
-                cols = st.columns(ratio if st.session_state.authenticated else ratio[:-1], vertical_alignment="center")
-                cols[0].markdown(f"<span class='row-marker'></span><span class='cat-text-bold'>{row['분류']}</span>", unsafe_allow_html=True)
-                cols[1].markdown(f"<span class='word-text'>{row['단어-문장']}</span>", unsafe_allow_html=True)
-                cols[2].markdown(f"<span class='mean-text'>{row['해석']}</span>", unsafe_allow_html=True)
+                for idx, row in page_df.iterrows():
+                    cols = st.columns(ratio if st.session_state.authenticated else ratio[:-1], vertical_alignment="center")
+                    cols[0].markdown(f"<span class='row-marker'></span><span class='cat-text-bold'>{row['분류']}</span>", unsafe_allow_html=True)
+                    cols[1].markdown(f"<span class='word-text'>{row['단어-문장']}</span>", unsafe_allow_html=True)
+                    cols[2].markdown(f"<span class='mean-text'>{row['해석']}</span>", unsafe_allow_html=True)
                 
-                btn_label = f"✏️ {row.get('row_idx', '')}"
+                    btn_label = f"✏️ {row.get('row_idx', '')}"
                 
-                if not is_simple:
-                    cols[3].write(row['발음']); cols[4].write(row['메모1']); cols[5].write(row['메모2'])
-                    if st.session_state.authenticated and cols[6].button(btn_label, key=f"e_{row['sheet_idx']}_{row['row_idx']}", type="tertiary"): 
+                    if not is_simple:
+                        cols[3].write(row['발음']); cols[4].write(row['메모1']); cols[5].write(row['메모2'])
+                        if st.session_state.authenticated and cols[6].button(btn_label, key=f"e_{row['uid']}", type="tertiary"): 
+                            edit_dialog(row['row_idx'], row['sheet_idx'], row.to_dict(), unique_cats)
+                    elif st.session_state.authenticated and cols[3].button(btn_label, key=f"es_{row['uid']}", type="tertiary"): 
                         edit_dialog(row['row_idx'], row['sheet_idx'], row.to_dict(), unique_cats)
-                elif st.session_state.authenticated and cols[3].button(btn_label, key=f"es_{row['sheet_idx']}_{row['row_idx']}", type="tertiary"): 
-                    edit_dialog(row['row_idx'], row['sheet_idx'], row.to_dict(), unique_cats)
 
         except Exception as e: st.error(f"오류 발생: {e}")
 
@@ -1180,12 +1462,14 @@ else:
     # ==============================================================
     elif st.session_state.app_mode == 'Links':
         try:
-            df_links_raw = get_links_data_v6()
+            with perf.phase("load"):
+                df_links_raw = get_links_data_v6()
+                revalidate_links()
             
             unique_links_cats1 = sorted([x for x in df_links_raw['대분류'].unique().tolist() if x != ''])
             unique_links_cats2 = sorted([x for x in df_links_raw['소분류'].unique().tolist() if x != ''])
             
-            sel_link_cat1 = st.radio("대분류 필터", ["전체 링크", "✨ 최근 5개"] + unique_links_cats1, horizontal=True, label_visibility="collapsed")
+            sel_link_cat1 = st.radio("대분류 필터", ["전체 링크", "✨ 최근 5개"] + unique_links_cats1, horizontal=True, label_visibility="collapsed", on_change=reset_page)
             
             sel_link_cat2 = "전체"
             if sel_link_cat1 not in ["전체 링크", "✨ 최근 5개"]:
@@ -1193,19 +1477,21 @@ else:
                 if subset_cat2:
                     display_cat2 = ["전체"] + subset_cat2
                     st.markdown("<div style='margin-top:-15px;'></div>", unsafe_allow_html=True)
-                    sel_link_cat2 = st.radio("소분류 필터", display_cat2, horizontal=True, label_visibility="collapsed", key="cat2_radio")
+                    sel_link_cat2 = st.radio("소분류 필터", display_cat2, horizontal=True, label_visibility="collapsed", key="cat2_radio", on_change=reset_page)
 
             search = st.session_state.active_search
-            filtered_df_links = df_links_raw
-            if search:
-                filtered_df_links = df_links_raw[df_links_raw['제목'].str.contains(search, case=False, na=False) | df_links_raw['메모'].str.contains(search, case=False, na=False) | df_links_raw['링크'].str.contains(search, case=False, na=False)]
-            else:
-                if sel_link_cat1 == "✨ 최근 5개":
-                    filtered_df_links = filtered_df_links.tail(5) 
-                elif sel_link_cat1 != "전체 링크":
-                    filtered_df_links = filtered_df_links[filtered_df_links['대분류'] == sel_link_cat1]
-                    if sel_link_cat2 != "전체":
-                        filtered_df_links = filtered_df_links[filtered_df_links['소분류'] == sel_link_cat2]
+            links_sig = (search, sel_link_cat1, sel_link_cat2)
+            with perf.phase("filter"):
+                filtered_df_links = df_links_raw
+                if search:
+                    filtered_df_links = df_links_raw.iloc[links_search_index(df_links_raw).search(search)]
+                else:
+                    if sel_link_cat1 == "✨ 최근 5개":
+                        filtered_df_links = filtered_df_links.tail(5) 
+                    elif sel_link_cat1 != "전체 링크":
+                        filtered_df_links = filtered_df_links[filtered_df_links['대분류'] == sel_link_cat1]
+                        if sel_link_cat2 != "전체":
+                            filtered_df_links = filtered_df_links[filtered_df_links['소분류'] == sel_link_cat2]
 
             st.markdown("<div style='background-color: rgba(0,0,0,0.25); padding: 15px 20px; border-radius: 15px; margin: 20px 0; border: 1px solid rgba(255,255,255,0.05);'>", unsafe_allow_html=True)
             cb_cols = [2.5, 2, 1.5, 1.5, 1.2] if st.session_state.authenticated else [3.5, 1.5, 1.5, 1.2]
@@ -1221,19 +1507,31 @@ else:
                 if cb[1].button("➕ 새 링크 추가", type="primary", use_container_width=True):
                     add_link_dialog(unique_links_cats1, unique_links_cats2)
                     
-            cb[csv_idx].download_button("📥 CSV 추출", data=convert_df_to_csv(filtered_df_links), file_name=f"Links_{time.strftime('%Y%m%d')}.csv", use_container_width=True)
+            cb[csv_idx].download_button("📥 CSV 추출", data=convert_df_to_csv(filtered_df_links, view_key(filtered_df_links), links_sig), file_name=f"Links_{time.strftime('%Y%m%d')}.csv", use_container_width=True)
             
             if cb[prt_idx].button("🖨️ A4 인쇄", use_container_width=True):
                 with st.spinner("🖨️ 인쇄 미리보기를 준비 중입니다... (데이터가 많을 경우 수 초가 소요됩니다)"):
-                    print_table(filtered_df_links, "TOmBOy94 링크 모음")
+                    print_table(filtered_df_links, "TOmBOy94 링크 모음", links_sig)
                 
             if cb[sync_idx].button("🔄 갱신", use_container_width=True):
+                request_links_reload()
                 st.cache_data.clear()
                 st.rerun()
                 
             st.markdown("</div>", unsafe_allow_html=True)
             
-            st.markdown(f"<div style='display:flex; justify-content:flex-end; padding-right:10px;'><span style='color:#A3B8B8; font-weight:bold; font-size:1.0rem;'>{('🔍 검색: ' + search + ' | ') if search else ''}총 {len(filtered_df_links)}개 링크</span></div>", unsafe_allow_html=True)
+            # ★ 링크 목록도 페이지 단위로만 그린다 (행마다 위젯 5~6개 → 수천 개 링크면 rerun 마다 수만 개). ?links_page=off → 전체 (이전 방식)
+            total = len(filtered_df_links)
+            paged_links = st.query_params.get("links_page") != "off"
+            pages = ceil(total / LINKS_PAGE_SIZE) if paged_links and total > 0 else 1
+            st.session_state.curr_p = curr_p = min(st.session_state.curr_p, pages)
+            page_links = filtered_df_links.iloc[(curr_p-1)*LINKS_PAGE_SIZE : curr_p*LINKS_PAGE_SIZE] if paged_links else filtered_df_links
+            perf.count("rows rendered", len(page_links))
+
+            links_state = _links_state()
+            as_of = data_as_of_label(links_state, links_state["fetched_at"])
+            st.markdown(f"<div style='display:flex; justify-content:flex-end; padding-right:10px;'><span style='color:#A3B8B8; font-weight:bold; font-size:1.0rem;'>{('🔍 검색: ' + search + ' | ') if search else ''}총 {total}개 링크{f' (Page {curr_p}/{pages})' if pages > 1 else ''}{(' | ' + as_of) if as_of else ''}</span></div>", unsafe_allow_html=True)
+            if links_state["refreshing"]: _wait_for_background_refresh(links_state)
 
             l_ratio = [1.2, 1.2, 2.5, 2.0, 2.5, 1.2] if st.session_state.authenticated else [1.2, 1.2, 2.5, 2.0, 2.5]
             l_labels = ["대분류", "소분류", "제목", "메모", "링크", "수정"] if st.session_state.authenticated else ["대분류", "소분류", "제목", "메모", "링크"]
@@ -1247,7 +1545,7 @@ else:
             if filtered_df_links.empty:
                 st.info("등록된 링크가 없습니다.")
             else:
-                for idx, row in filtered_df_links.iterrows():
+                for idx, row in page_links.iterrows():
                     cols = st.columns(l_ratio, vertical_alignment="center")
                     cols[0].markdown(f"<span class='row-marker'></span><span class='link-table-cat1'>{row['대분류']}</span>", unsafe_allow_html=True)
                     cols[1].markdown(f"<span class='link-table-cat2'>{row['소분류']}</span>", unsafe_allow_html=True)
@@ -1262,13 +1560,13 @@ else:
                     
                     btn_label_link = f"✏️ {row.get('row_idx', '')}"
                     if st.session_state.authenticated:
-                        if len(cols) > 5 and cols[5].button(btn_label_link, key=f"el_{row['row_idx']}", type="tertiary"):
+                        if len(cols) > 5 and cols[5].button(btn_label_link, key=f"el_{row['uid']}", type="tertiary"):
                             edit_link_dialog(row['row_idx'], row.to_dict(), unique_links_cats1, unique_links_cats2)
 
         except Exception as e: st.error(f"링크 데이터 오류 발생: {e}")
 
     # --- 공통 푸터 (페이지 네비게이션 포함) ---
-    if st.session_state.app_mode == 'English' and 'pages' in locals() and pages > 1:
+    if st.session_state.app_mode in ('English', 'Links') and 'pages' in locals() and pages > 1:
         st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
         
         start_p = max(1, st.session_state.curr_p - 4)
@@ -1302,3 +1600,12 @@ else:
             </p>
         </div>
     """, unsafe_allow_html=True)
+
+# ★ 성능 패널 (?perf=1) - 이번 rerun 의 구간 시간 / 구글 API 호출 / 캐시 적중·미스 / 색인 재생성
+perf_rec = perf.finish()
+if perf_rec:
+    with st.expander(f"⏱️ 성능 (이번 rerun: {perf_rec['total_ms']:.0f} ms)"):
+        p_col1, p_col2 = st.columns(2)
+        p_col1.dataframe(pd.DataFrame(list(perf_rec["phases"].items()) + [("기타 (렌더링 등)", perf_rec["other_ms"])], columns=["구간", "ms"]), hide_index=True, use_container_width=True)
+        p_col2.dataframe(pd.DataFrame(list(perf_rec["counts"].items()), columns=["항목", "횟수"]), hide_index=True, use_container_width=True)
+        st.caption(f"{perf.PERF_LOG} 에 한 줄씩 기록됩니다.")
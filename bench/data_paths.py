@@ -0,0 +1,157 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# --- [app.py 데이터 경로 오프라인 벤치마크 (가짜 gspread)] ---
+#   python bench/data_paths.py                                # 1k / 10k / 100k 행, 저장된 기준값과 비교
+#   python bench/data_paths.py --sizes 10000 --latency 0.15   # 호출당 지연을 넣어 첫 로드 측정
+#   python bench/data_paths.py --save-baseline                # 이번 결과를 기준값으로 저장 (data_paths_baseline.json)
+# 기준값은 돌린 기계마다 다르므로 저장소에 올리지 않는다 (.gitignore) - 바꾸기 전에 한 번 저장해 두고 비교한다.
+# app.py 를 AppTest 로 ?perf=1 로 돌려, rerun 마다 perf 로그에 남는 구간 시간으로 경로별 비용을 잰다.
+#   load (cold)  : get_english_data_v7 첫 호출 (시트 동기화 + 검색/분류/정렬 색인)
+#   load (cache) : 캐시 적중
+#   search / category / sort : 목록 내 검색, 분류 선택, '단어-문장' 오름차순
+#   print        : generate_print_html ('전체 분류' 전체 행)
+#   study        : 학습 모드 분류별 JSON 조각 (study_slices)
+# 시간은 --repeat 번 (매번 캐시를 비운 새 앱) 의 중앙값, 메모리는 tracemalloc 을 켠 한 번의 rerun 이 그 전보다 더 쓴 최대치.
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_paths_baseline.json")
+
+# (이름, 세션 상태 변경, 측정할 perf 구간)
+SCENARIOS = [
+    ("load (cold)", {}, "load"),
+    ("load (cache)", {}, "load"),
+    ("search", {"active_search": "take"}, "filter"),
+    ("category", {"active_search": "", "cat_radio": "분류07", "current_cat": "분류07"}, "filter"),
+    ("sort", {"cat_radio": "전체 분류", "current_cat": "전체 분류", "sort_order": "asc"}, "sort"),
+    ("print", {}, "print"),
+]
+
+
+def make_app(book, **query):
+    import gspread
+    from google.oauth2 import service_account
+    from streamlit.testing.v1 import AppTest
+    from fake_gspread import FakeClient
+    import snapshot_store
+
+    snapshot_store.SNAPSHOT_DIR = tempfile.mkdtemp(prefix="bench-snapshot-")
+    snapshot_store.SNAPSHOT_DB = os.path.join(snapshot_store.SNAPSHOT_DIR, "snapshot.sqlite")
+    gspread.authorize = lambda creds: FakeClient([book])
+    service_account.Credentials.from_service_account_info = classmethod(lambda cls, info, scopes=None: object())
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=900)
+    at.secrets["tom_password"] = "bench"
+    at.secrets["gcp_service_account"] = {}
+    at.query_params["perf"] = "1"
+    for k, v in query.items():
+        at.query_params[k] = v
+    return at
+
+
+def last_record():
+    import perf
+    with open(perf.PERF_LOG, encoding="utf-8") as f:
+        return json.loads(f.readlines()[-1])
+
+
+def run_once(at, traced, click=None):
+    before = 0
+    if traced:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+    if click:
+        at.button[[b.label for b in at.button].index(click)].click()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+    peak = tracemalloc.get_traced_memory()[1] - before if traced else 0
+    return last_record(), peak
+
+
+def run_scenarios(book, traced):
+    import perf
+    import streamlit as st
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    perf.PERF_LOG = os.path.join(tempfile.mkdtemp(prefix="bench-perf-"), "perf.jsonl")
+    out = {}
+    at = make_app(book)
+    for name, state, phase in SCENARIOS:
+        for k, v in state.items():
+            at.session_state[k] = v
+        rec, peak = run_once(at, traced, click="🖨️ A4 인쇄" if name == "print" else None)
+        out[name] = (rec["phases"].get(phase, 0.0), peak)
+    rec, peak = run_once(make_app(book, study="true"), traced)
+    out["study"] = (rec["phases"].get("study payload", 0.0), peak)
+    return out
+
+
+def measure(book, repeat):
+    runs = [run_scenarios(book, False) for _ in range(repeat)]
+    tracemalloc.start()
+    try:
+        mem = run_scenarios(book, True)
+    finally:
+        tracemalloc.stop()
+    return {name: {"ms": round(statistics.median(r[name][0] for r in runs), 2), "peak_mb": round(mem[name][1] / 2**20, 2)} for name in mem}
+
+
+def delta(now, base):
+    if not base:
+        return "-"
+    return f"{(now - base) / base * 100:+.0f}%"
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--tabs", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.0, help="가짜 백엔드 호출당 지연(초)")
+    ap.add_argument("--per-row", type=float, default=0.0, help="가짜 백엔드 행당 전송 지연(초)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--save-baseline", action="store_true")
+    args = ap.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    from fake_gspread import make_english_book
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'rows':>7} {'path':<13} {'ms':>9} {'base ms':>9} {'Δ':>6} {'peak MB':>8} {'base MB':>8} {'Δ':>6}")
+    for n in args.sizes:
+        book = make_english_book(n, args.tabs, latency=args.latency, per_row=args.per_row)
+        t0 = time.perf_counter()
+        results[str(n)] = res = measure(book, args.repeat)
+        for name, r in res.items():
+            b = baseline.get(str(n), {}).get(name, {})
+            print(f"{n:>7} {name:<13} {r['ms']:>9.1f} {b.get('ms', '-'):>9} {delta(r['ms'], b.get('ms')):>6} "
+                  f"{r['peak_mb']:>8.1f} {b.get('peak_mb', '-'):>8} {delta(r['peak_mb'], b.get('peak_mb')):>6}")
+        print(f"{'':>7} ({time.perf_counter() - t0:.1f} s)")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        print(f"기준값 저장: {BASELINE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# --- [영어 목록 렌더링: 행마다 st.columns (?grid=off) vs 그리드 컴포넌트 1개] ---
+#   python bench/english_list_render.py --rows 20000 --reruns 10
+# 가짜 gspread 로 app.py 를 AppTest 로 돌려, 페이지 이동 rerun 한 번의 스크립트 실행 시간과
+# 브라우저로 보내는 요소 수를 비교한다. (브라우저 페인트 시간은 요소 수에 비례 - 오프라인이라 직접 재지는 않는다)
+
+
+def count_elements(node):
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(c) for c in children.values())
+
+
+def make_app(book, grid):
+    import gspread
+    from google.oauth2 import service_account
+    from streamlit.testing.v1 import AppTest
+    from fake_gspread import FakeClient
+    import snapshot_store
+
+    # 실제 스냅샷(.cache)을 가짜 데이터로 덮어쓰지 않도록 임시 폴더로 돌린다
+    snapshot_store.SNAPSHOT_DIR = tempfile.mkdtemp(prefix="bench-snapshot-")
+    snapshot_store.SNAPSHOT_DB = os.path.join(snapshot_store.SNAPSHOT_DIR, "snapshot.sqlite")
+    gspread.authorize = lambda creds: FakeClient([book])
+    service_account.Credentials.from_service_account_info = classmethod(lambda cls, info, scopes=None: object())
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=300)
+    at.secrets["tom_password"] = "bench"
+    at.secrets["gcp_service_account"] = {}
+    at.query_params["auth"] = "true"
+    if not grid:
+        at.query_params["grid"] = "off"
+    return at
+
+
+def measure(book, grid, reruns):
+    at = make_app(book, grid)
+    at.run()
+    at.radio(key="cat_radio").set_value("전체 분류").run()
+    times = []
+    for p in range(reruns):
+        at.session_state["curr_p"] = p % 9 + 2
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return times, count_elements(at._tree), len(at.button)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=20000)
+    ap.add_argument("--tabs", type=int, default=8)
+    ap.add_argument("--reruns", type=int, default=10)
+    args = ap.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    from fake_gspread import make_english_book
+    book = make_english_book(args.rows, args.tabs)
+
+    print(f"{'renderer':<10} {'elements':>9} {'buttons':>8} {'median ms':>10} {'min ms':>8}")
+    for name, grid in [("columns", False), ("grid", True)]:
+        times, elements, buttons = measure(book, grid, args.reruns)
+        print(f"{name:<10} {elements:>9} {buttons:>8} {statistics.median(times) * 1000:>10.1f} {min(times) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
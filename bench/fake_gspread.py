@@ -0,0 +1,118 @@
+import random
+import re
+import threading
+import time
+
+# --- [오프라인 벤치마크용 가짜 gspread] ---
+# gspread.Client / Spreadsheet / Worksheet 중 app.py·sheet_sync 가 쓰는 메서드만 메모리로 흉내 낸다.
+# 호출마다 latency(초) + 행당 per_row(초) 만큼 지연시켜 네트워크 비용을 흉내 내고, API 호출 수를 센다.
+
+HEADER = ['분류', '단어-문장', '해석', '발음', '메모1', '메모2']
+_RANGE_RE = re.compile(r"^'((?:[^']|'')*)'(?:!([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?)?$")
+
+
+def _trim(values):
+    rows = [list(r) for r in values]
+    while rows and not any(str(c) for c in rows[-1]):
+        rows.pop()
+    return rows
+
+
+class FakeWorksheet:
+    def __init__(self, book, title, rows, sheet_id):
+        self.spreadsheet = book
+        self.title = title
+        self.id = sheet_id
+        self.rows = rows
+
+    def get_all_values(self):
+        rows = _trim(self.rows)
+        self.spreadsheet._call("values.get", len(rows))
+        return [list(r) for r in rows]
+
+
+class FakeSpreadsheet:
+    def __init__(self, title, sheets, latency=0.0, per_row=0.0):
+        self.title = title
+        self.id = "fake-" + title
+        self.latency = latency
+        self.per_row = per_row
+        self.calls = {}
+        self.modified = 0
+        self._lock = threading.Lock()
+        self._sheets = [FakeWorksheet(self, t, rows, i) for i, (t, rows) in enumerate(sheets.items())]
+
+    def _call(self, name, n_rows=0):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency or self.per_row:
+            time.sleep(self.latency + self.per_row * n_rows)
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls = {}
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def get_lastUpdateTime(self):
+        self._call("drive.files.get")
+        return f"fake-{self.modified}"
+
+    def fetch_sheet_metadata(self, params=None):
+        self._call("spreadsheets.get")
+        return {"sheets": [{"properties": {"title": w.title, "sheetId": w.id, "index": i}} for i, w in enumerate(self._sheets)]}
+
+    def worksheets(self):
+        self.fetch_sheet_metadata()
+        return list(self._sheets)
+
+    def worksheet(self, title):
+        self.fetch_sheet_metadata()
+        for w in self._sheets:
+            if w.title == title:
+                return w
+        raise KeyError(title)
+
+    def values_batch_get(self, ranges, params=None):
+        out, total = [], 0
+        for rng in ranges:
+            m = _RANGE_RE.match(rng)
+            title = m.group(1).replace("''", "'")
+            start = int(m.group(3)) if m.group(3) else 1
+            end = int(m.group(5)) if m.group(5) else None
+            width = ord(m.group(4)) - 64 if m.group(4) else None
+            ws = next(w for w in self._sheets if w.title == title)
+            rows = _trim([r[:width] for r in _trim(ws.rows)[start - 1:end]])
+            total += len(rows)
+            out.append({"range": rng, "values": rows} if rows else {"range": rng})
+        self._call("values.batchGet", total)
+        return {"valueRanges": out}
+
+
+class FakeClient:
+    def __init__(self, books):
+        self.books = {b.title: b for b in books}
+
+    def open(self, title):
+        book = self.books[title]
+        book._call("drive.files.list")
+        book.fetch_sheet_metadata()
+        return book
+
+
+def make_english_book(n_rows, n_tabs, latency=0.0, per_row=0.0, seed=94, n_links=100):
+    # n_rows 문장을 n_tabs 개 탭에 나눠 담은 English_Sentences (+ 링크 / 임시 탭)
+    rnd = random.Random(seed)
+    cats = [f"분류{i:02d}" for i in range(40)]
+    words = "take make give run look think speak walk apple 사과 달리다 말하다 생각하다 주다 보다 걷다".split()
+    sheets = {}
+    for t in range(n_tabs):
+        rows = [list(HEADER)]
+        for i in range(n_rows // n_tabs + (1 if t < n_rows % n_tabs else 0)):
+            en = " ".join(rnd.choice(words) for _ in range(rnd.randint(2, 8)))
+            rows.append([rnd.choice(cats), f"{en} #{t}-{i}", "해석 " + rnd.choice(words), "", "메모" if i % 4 == 0 else "", ""])
+        sheets[f"탭{t + 1}"] = rows
+    sheets["링크"] = [['대분류', '소분류', '제목', '메모', '링크']] + [[f"대분류{i % 8}", f"소분류{i % 5}" if i % 3 else "", f"link {i}", "메모" if i % 2 else "", f"https://example.com/{i}"] for i in range(n_links)]
+    sheets["임시 메모"] = [["x"]]
+    return FakeSpreadsheet("English_Sentences", sheets, latency=latency, per_row=per_row)
@@ -0,0 +1,86 @@
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# --- [링크 모음 렌더링: 전체 행 (?links_page=off) vs 페이지 단위] ---
+#   python bench/links_render.py --links 1000 5000 20000 --reruns 5
+# 가짜 gspread 로 app.py 를 AppTest 로 돌려, '전체 링크' 화면 rerun 한 번의 스크립트 실행 시간과 요소 수를 비교한다.
+
+
+def count_elements(node):
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(count_elements(c) for c in children.values())
+
+
+def make_app(book, paged):
+    import gspread
+    from google.oauth2 import service_account
+    from streamlit.testing.v1 import AppTest
+    from fake_gspread import FakeClient
+    import snapshot_store
+    import streamlit as st
+
+    st.cache_data.clear()      # 링크 상태는 cache_resource 라 프로세스 안에서 크기별로 새로 읽게 비운다
+    st.cache_resource.clear()
+    snapshot_store.SNAPSHOT_DIR = tempfile.mkdtemp(prefix="bench-snapshot-")
+    snapshot_store.SNAPSHOT_DB = os.path.join(snapshot_store.SNAPSHOT_DIR, "snapshot.sqlite")
+    gspread.authorize = lambda creds: FakeClient([book])
+    service_account.Credentials.from_service_account_info = classmethod(lambda cls, info, scopes=None: object())
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=600)
+    at.secrets["tom_password"] = "bench"
+    at.secrets["gcp_service_account"] = {}
+    at.query_params["auth"] = "true"
+    if not paged:
+        at.query_params["links_page"] = "off"
+    return at
+
+
+def measure(book, paged, reruns):
+    at = make_app(book, paged)
+    at.session_state["app_mode"] = "Links"
+    at.run()
+    times = []
+    for p in range(reruns):
+        at.session_state["curr_p"] = p % 9 + 1
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return times, count_elements(at._tree)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--links", type=int, nargs="+", default=[1000, 5000, 20000])
+    ap.add_argument("--reruns", type=int, default=5)
+    ap.add_argument("--skip-all-above", type=int, default=20000, help="이보다 많으면 전체 렌더는 건너뛴다 (너무 느림)")
+    args = ap.parse_args()
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore")
+    from fake_gspread import make_english_book
+
+    print(f"{'links':>7} {'renderer':<8} {'elements':>9} {'median ms':>10} {'min ms':>8}")
+    for n in args.links:
+        book = make_english_book(200, 2, n_links=n)
+        for name, paged in [("all", False), ("paged", True)]:
+            if not paged and n > args.skip_all_above:
+                continue
+            times, elements = measure(book, paged, args.reruns)
+            print(f"{n:>7} {name:<8} {elements:>9} {statistics.median(times) * 1000:>10.1f} {min(times) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sheet_sync  # noqa: E402
+
+# --- [English_Sentences 전체 조회: 스레드풀(2×N) vs values:batchGet(1회) 지연시간 비교] ---
+#   python bench/sheets_fetch.py --live                   # .streamlit/secrets.toml 의 서비스 계정으로 실제 시트 측정
+#   python bench/sheets_fetch.py --rows 20000 --tabs 8    # 가짜 gspread (호출당 지연 + 행당 전송 지연 모델)
+
+
+def open_live_book():
+    import tomllib
+    import gspread
+    from google.oauth2.service_account import Credentials
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".streamlit", "secrets.toml"), "rb") as f:
+        secrets = tomllib.load(f)
+    scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+    creds = Credentials.from_service_account_info(secrets["gcp_service_account"], scopes=scopes)
+    return gspread.authorize(creds).open("English_Sentences")
+
+
+def measure(wb, loader, titles, repeat):
+    times, calls, rows = [], None, 0
+    for _ in range(repeat):
+        if hasattr(wb, "reset_calls"): wb.reset_calls()
+        t0 = time.perf_counter()
+        out = loader(wb, titles)
+        times.append(time.perf_counter() - t0)
+        rows = sum(len(r) for r in out.values())
+        if hasattr(wb, "total_calls"): calls = wb.total_calls()
+    return times, calls, rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--live", action="store_true")
+    ap.add_argument("--rows", type=int, default=20000)
+    ap.add_argument("--tabs", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.15, help="가짜 백엔드 호출당 지연(초)")
+    ap.add_argument("--per-row", type=float, default=0.00002, help="가짜 백엔드 행당 전송 지연(초)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.live:
+        wb = open_live_book()
+    else:
+        from fake_gspread import make_english_book
+        wb = make_english_book(args.rows, args.tabs, latency=args.latency, per_row=args.per_row)
+    titles = [ws.title for ws in wb.worksheets() if sheet_sync.is_english_sheet(ws.title)]
+
+    print(f"{'loader':<10} {'rows':>7} {'calls':>6} {'median ms':>10} {'min ms':>8}")
+    for name, loader in [("threaded", sheet_sync.fetch_rows_threaded), ("batchGet", sheet_sync.fetch_rows_batch)]:
+        times, calls, rows = measure(wb, loader, titles, args.repeat)
+        print(f"{name:<10} {rows:>7} {calls if calls is not None else '-':>6} {statistics.median(times) * 1000:>10.1f} {min(times) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
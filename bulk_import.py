@@ -0,0 +1,96 @@
+import csv
+import io
+
+import pandas as pd
+
+from sheet_sync import ENG_COLS
+
+# --- [영어 문장 일괄 등록 (CSV / XLSX / 붙여넣은 TSV)] ---
+# 읽기 → 열 맞추기 (헤더가 있으면 이름으로, 없으면 순서대로) → 검사 → 기존 데이터/파일 안 중복 제거 → 시트별 묶음.
+# 실제 쓰기는 app.py 에서 시트마다 append_rows 한 번.
+
+SHEET_COL = '시트'          # 있으면 행마다 저장할 시트를 고른다 (없으면 기본 시트)
+MAX_CELL = 50000            # 구글 시트 셀 최대 글자 수
+MAX_ROWS = 5000
+
+
+def dedupe_key(text):
+    # 대소문자/공백 차이는 같은 문장으로 본다
+    return " ".join(str(text).lower().split())
+
+
+def _decode(data):
+    for enc in ('utf-8-sig', 'cp949'):
+        try:
+            return data.decode(enc)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("파일 인코딩을 읽을 수 없습니다 (UTF-8 또는 CP949 로 저장해 주세요)")
+
+
+def read_rows(name=None, data=None, text=None):
+    # → [[셀, ...], ...] (문자열)
+    if text is not None:
+        # 엑셀에서 복사한 텍스트는 따옴표를 감싸지 않는다 → 셀 안의 " 를 그대로 둔다
+        return [row for row in csv.reader(io.StringIO(text), delimiter='\t', quoting=csv.QUOTE_NONE)]
+    lower = (name or "").lower()
+    if lower.endswith(('.xlsx', '.xlsm')):
+        try:
+            df = pd.read_excel(io.BytesIO(data), header=None, dtype=str, engine='openpyxl')
+        except ImportError:
+            raise ValueError("XLSX 를 읽으려면 openpyxl 이 필요합니다 (CSV 로 저장해 올려 주세요)")
+        except Exception:
+            raise ValueError("XLSX 파일을 읽을 수 없습니다")
+        return df.fillna("").to_numpy().tolist()
+    body = _decode(data)
+    delimiter = '\t' if lower.endswith(('.tsv', '.txt')) or ('\t' in body.split('\n', 1)[0]) else ','
+    return [row for row in csv.reader(io.StringIO(body), delimiter=delimiter)]
+
+
+def _columns(header):
+    # 첫 행이 헤더인지 판단 → {열 이름: 위치}. 헤더가 아니면 None
+    names = [str(c).replace(" ", "").strip() for c in header]
+    if '단어-문장' not in names:
+        return None
+    return {n: i for i, n in enumerate(names) if n in ENG_COLS or n == SHEET_COL}
+
+
+def prepare(rows, existing_keys, default_sheet, sheets, default_cat=""):
+    # → {"batches": {시트: [[6칸], ...]}, "preview": DataFrame, "dup": 중복 수, "invalid": [(줄 번호, 사유)]}
+    rows = [[str(c).strip() for c in r] for r in rows]
+    cols = _columns(rows[0]) if rows else None
+    start = 1 if cols is not None else 0
+    if cols is None:
+        cols = {c: i for i, c in enumerate(ENG_COLS)}
+
+    batches, preview, invalid, seen, dup = {}, [], [], set(), 0
+    for line, r in enumerate(rows[start:], start=start + 1):
+        if not any(r):
+            continue
+        values = [r[cols[c]] if c in cols and cols[c] < len(r) else "" for c in ENG_COLS]
+        if not values[0]:
+            values[0] = default_cat
+        sheet = r[cols[SHEET_COL]] if SHEET_COL in cols and cols[SHEET_COL] < len(r) and r[cols[SHEET_COL]] else default_sheet
+        if not values[1]:
+            invalid.append((line, "단어-문장이 비어 있음"))
+        elif sheet not in sheets:
+            invalid.append((line, f"없는 시트: {sheet}"))
+        elif any(len(v) > MAX_CELL for v in values):
+            invalid.append((line, f"셀이 {MAX_CELL}자를 넘음"))
+        else:
+            key = dedupe_key(values[1])
+            if key in existing_keys or key in seen:
+                dup += 1
+                continue
+            seen.add(key)
+            batches.setdefault(sheet, []).append(values)
+            preview.append([sheet] + values)
+    total = sum(len(b) for b in batches.values())
+    if total > MAX_ROWS:
+        raise ValueError(f"한 번에 {MAX_ROWS}행까지 등록할 수 있습니다 (현재 {total}행)")
+    return {
+        "batches": batches,
+        "preview": pd.DataFrame(preview, columns=[SHEET_COL] + ENG_COLS),
+        "dup": dup,
+        "invalid": invalid,
+    }
@@ -0,0 +1,98 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+
+import pandas as pd
+import streamlit.components.v1 as components
+
+# --- [커스텀 컴포넌트 (frontend/ 아래 정적 index.html)] ---
+# 빌드 단계 없이 postMessage 로 Streamlit 과 직접 주고받는다. 값(클릭 이벤트)은 {"action": ..., "n": 일련번호} 형태.
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+
+_english_grid = components.declare_component("english_grid", path=os.path.join(FRONTEND_DIR, "english_grid"))
+_study_mode = components.declare_component("study_mode", path=os.path.join(FRONTEND_DIR, "study"))
+
+GRID_COLS = ['분류', '단어-문장', '해석', '발음', '메모1', '메모2', 'sheet_idx', 'row_idx', 'uid']
+STUDY_COLS = ['분류', '단어-문장', '해석', '발음', '메모1', '메모2']
+STUDY_FIRST_ROWS = 500      # 전체 랜덤으로 열 때 첫 화면에 실어 보내는 행 수 (무작위 분류 몇 개)
+LIST_GZIP_MIN = 256 * 1024   # 목록 전체 전송 시 이보다 큰 JSON 은 gzip + base64 로 보낸다 (None 이면 압축 안 함)
+
+
+def grid_rows(df):
+    # 한 페이지 분량 → [[분류, 단어-문장, 해석, 발음, 메모1, 메모2, sheet_idx, row_idx, uid], ...] (JSON 한 덩어리)
+    if df.empty:
+        return []
+    rows = df[GRID_COLS].astype(str).to_numpy().tolist()
+    for r, ri in zip(rows, df['row_idx'].tolist()):
+        r[7] = int(ri)
+    return rows
+
+
+def list_payload(df, rank, gzip_min=LIST_GZIP_MIN):
+    # 필터 결과 전체 → 컬럼 단위 JSON 문자열, 인코딩("json" / "gzip")
+    # {"n", "cols": [[분류...], [단어-문장...], ...6개], "sheets": [시트명], "sheet": [코드], "row": [row_idx], "uid": [uid], "rank": [오름차순 순위]}
+    codes, sheets = pd.factorize(df['sheet_idx'].astype(str))
+    text = json.dumps({
+        "n": len(df),
+        "cols": [df[c].astype(str).tolist() for c in GRID_COLS[:6]],
+        "sheets": list(sheets),
+        "sheet": codes.tolist(),
+        "row": [int(x) for x in df['row_idx'].tolist()],
+        "uid": df['uid'].astype(str).tolist(),
+        "rank": [int(x) for x in rank],
+    }, ensure_ascii=False, separators=(',', ':'))
+    if gzip_min is not None and len(text) >= gzip_min:
+        return base64.b64encode(gzip.compress(text.encode('utf-8'), 6)).decode('ascii'), "gzip"
+    return text, "json"
+
+
+# ★ 영어 목록 그리드 - 30행 × 6~7개 위젯 대신 컴포넌트 1개. 수정/정렬 클릭은 on_change 콜백으로 받는다
+# data 를 주면 (list_payload 결과) 필터 결과 전체를 한 번 보내고 페이지/정렬/목록 내 검색은 브라우저에서 처리한다
+def english_grid(df, simple, editable, sort, key, on_change=None, data=None, encoding=None, data_key=None):
+    rows = grid_rows(df) if df is not None else []
+    return _english_grid(rows=rows, simple=simple, editable=editable, sort=sort, data=data, encoding=encoding, data_key=data_key,
+                         key=key, default=None, on_change=on_change)
+
+
+def study_slices(df, cat_index):
+    # 분류별 [[분류, 단어-문장, 해석, 발음, 메모1, 메모2], ...] JSON 문자열 + 행 수 + 지문 (빈 분류 "" 포함)
+    # 지문은 브라우저 캐시(IndexedDB) 대조용 - 버전이 바뀌어도 내용이 같은 분류는 다시 보내지 않는다
+    values = df[STUDY_COLS].astype(str).to_numpy() if not df.empty else None
+    slices = {cat: json.dumps(values[pos].tolist(), ensure_ascii=False, separators=(',', ':')) for cat, pos in cat_index.groups.items()}
+    return {
+        "slices": slices,
+        "counts": {cat: len(pos) for cat, pos in cat_index.groups.items()},
+        "fps": {cat: hashlib.sha1(text.encode('utf-8')).hexdigest()[:12] for cat, text in slices.items()},
+    }
+
+
+def study_first_cats(counts, initial):
+    # 처음 보낼 분류 - 특정 분류면 그것만, 전체 랜덤이면 STUDY_FIRST_ROWS 행이 찰 때까지 무작위 분류
+    if initial in counts:
+        return [initial]
+    cats, rows = [], 0
+    for cat in random.sample(list(counts), len(counts)):
+        cats.append(cat)
+        rows += counts[cat]
+        if rows >= STUDY_FIRST_ROWS:
+            break
+    return cats
+
+
+def review_cards(df, records):
+    # 복습 모드로 보낼 카드 → [[uid, 분류, 단어-문장, 해석, 발음, 메모1, 메모2, 틀린 횟수], ...] (df 는 보낼 순서대로)
+    if df.empty:
+        return []
+    rows = df[['uid'] + STUDY_COLS].astype(str).to_numpy().tolist()
+    return [r + [records.get(r[0], {}).get("lapses", 0)] for r in rows]
+
+
+# ★ 전체화면 학습 모드 - 요청받은 분류 조각만 보내고, 브라우저가 쌓아 둔다. 추가 요청은 {"action": "load", "cats": [...]}
+# 복습 모드는 {"action": "review", "cat", "user", "graded": [[id, uid, 답]], "k"} 로 다음 카드 묶음(review)을 받는다
+def study_mode(cats, study, initial, version, slices, key, on_change=None, review=None):
+    return _study_mode(cats=cats, counts=study["counts"], fps=study["fps"], initial=initial, version=version, slices=slices, review=review,
+                       key=key, default=None, on_change=on_change)
@@ -0,0 +1,40 @@
+import urllib.parse
+
+# --- [링크 모음 파생 색인] ---
+# 링크 데이터 버전(df.attrs["version"])마다 한 번 만든다. 검색은 text_index.NgramIndex, 중복 URL 확인은 UrlIndex.
+
+_TRACKING = ('utm_', 'fbclid', 'gclid')
+
+
+def normalize_url(url):
+    # 같은 주소로 볼 형태로 맞춘다: 스킴/www/기본 포트/끝 슬래시/#조각/추적 파라미터 무시, 호스트 소문자, 쿼리 정렬
+    u = str(url).strip()
+    if not u:
+        return ""
+    if "://" not in u:
+        u = "http://" + u
+    try:
+        p = urllib.parse.urlsplit(u)
+        port = p.port
+    except ValueError:
+        return u.lower()
+    host = (p.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = f":{port}" if port and port not in (80, 443) else ""
+    query = "&".join(sorted(q for q in p.query.split("&") if q and not q.lower().startswith(_TRACKING)))
+    return f"{host}{port}{p.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+
+class UrlIndex:
+    def __init__(self, df, col='링크'):
+        self.version = df.attrs.get("version")
+        self.rows = {}     # 정규화 URL → 행 위치 목록
+        urls = df[col].astype(str).tolist() if not df.empty else []
+        for pos, u in enumerate(urls):
+            key = normalize_url(u)
+            if key:
+                self.rows.setdefault(key, []).append(pos)
+
+    def find(self, url):
+        return self.rows.get(normalize_url(url), [])
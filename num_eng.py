@@ -0,0 +1,105 @@
+import re
+from functools import lru_cache
+
+# --- [Num.ENG 숫자 → 영어 변환] ---
+# 0~999 는 미리 만든 표에서 바로 꺼내고, 세 자리 묶음 × 단위("twelve million")는 lru_cache 로 재사용한다.
+# 금액 문자열(소수, $ / USD / dollar, ₩ / 원 / KRW / won, 음수)도 한 번에 여러 줄 변환한다.
+
+_ONES = ["", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+SCALES = ["", "thousand", "million", "billion", "trillion", "quadrillion", "quintillion", "sextillion", "septillion", "octillion", "nonillion", "decillion"]
+DIGITS = ["zero"] + _ONES[1:10]
+
+
+def _below_1000(n):
+    if n < 20:
+        return _ONES[n]
+    if n < 100:
+        return _TENS[n // 10] + ("-" + _ONES[n % 10] if n % 10 else "")
+    return _ONES[n // 100] + " hundred" + (" " + _below_1000(n % 100) if n % 100 else "")
+
+
+BELOW_1000 = [_below_1000(n) for n in range(1000)]   # 0 → ""
+
+
+@lru_cache(maxsize=8192)
+def _chunk(n, scale):
+    # 세 자리 묶음 하나 + 단위 (예: 12, 2 → "twelve million")
+    return BELOW_1000[n] + (" " + SCALES[scale] if scale else "")
+
+
+def num_to_eng(num):
+    if num == 0:
+        return "zero"
+    if num < 0:
+        return "minus " + num_to_eng(-num)
+    parts, scale = [], 0
+    while num:
+        if scale >= len(SCALES):
+            return None
+        num, n = divmod(num, 1000)
+        if n:
+            parts.append(_chunk(n, scale))
+        scale += 1
+    return " ".join(reversed(parts))
+
+
+_CURRENCY = [
+    ("usd", re.compile(r"^(?:\$|us\$|usd)\s*|\s*(?:\$|usd|dollars?|달러|불)$", re.I)),
+    ("krw", re.compile(r"^(?:₩|￦|krw)\s*|\s*(?:krw|won|원)$", re.I)),
+]
+_NUMBER_RE = re.compile(r"^([+-]?)(\d[\d,]*|)(?:\.(\d+))?$")
+
+
+def _unit(count, one, many):
+    return one if count == 1 else many
+
+
+@lru_cache(maxsize=4096)
+def amount_to_eng(text):
+    # "1,234.5" / "$12.30" / "12,000원" / "-7" → 영어 (읽을 수 없으면 None)
+    s = str(text).strip().replace(" ", "")
+    sign = ""
+    if s[:1] in "+-" and s:
+        sign, s = s[0], s[1:]
+    if not s:
+        return None
+    currency = None
+    for code, pat in _CURRENCY:
+        stripped = pat.sub("", s)
+        if stripped != s:
+            currency, s = code, stripped
+            break
+    m = _NUMBER_RE.match(s)
+    if not m or not (m.group(2) or m.group(3)) or (m.group(2) and not re.fullmatch(r"\d{1,3}(,\d{3})*|\d+", m.group(2))):
+        return None
+    whole = int(m.group(2).replace(",", "") or 0)
+    frac = m.group(3) or ""
+    words = num_to_eng(whole)
+    if words is None:
+        return None
+
+    if currency == "usd":
+        cents = int((frac + "00")[:2]) + (1 if frac[2:3] >= "5" else 0)   # 센트 아래는 반올림
+        if cents == 100:
+            whole, cents = whole + 1, 0
+            words = num_to_eng(whole)
+        out = f"{words} {_unit(whole, 'dollar', 'dollars')}"
+        if cents:
+            cent_words = f"{num_to_eng(cents)} {_unit(cents, 'cent', 'cents')}"
+            out = f"{out} and {cent_words}" if whole else cent_words
+    else:
+        out = words
+        if frac:
+            out += " point " + " ".join(DIGITS[int(d)] for d in frac)
+        if currency == "krw":
+            out += " won"
+    if m.group(1):
+        sign = m.group(1)
+    return ("minus " if sign == "-" and (whole or frac.strip("0")) else "") + out
+
+
+def convert_lines(text):
+    # 여러 줄 (엑셀 열 붙여넣기) → [(입력, 영어 또는 None)] - 빈 줄은 건너뛴다
+    lines = [line.strip() for line in str(text).splitlines()]
+    return [(line, amount_to_eng(line)) for line in lines if line]
@@ -0,0 +1,147 @@
+import functools
+import json
+import os
+import re
+import threading
+import urllib.parse
+import time
+from contextlib import contextmanager, nullcontext
+
+# --- [rerun 단위 성능 계측 (opt-in)] ---
+# ?perf=1 또는 secrets 의 perf_panel = true 일 때만 켠다. 켜지면 rerun 마다
+#   - phase("이름") 구간별 시간
+#   - 구글 API 호출 수 (gspread HTTPClient.request 를 감싸 엔드포인트 종류별로)
+#   - 캐시 함수 호출/미스 수 (cached(...) 로 감싼 st.cache_* 함수)
+# 를 모아 화면 아래 접이식 패널로 보여 주고, PERF_LOG 에 JSON 한 줄씩 남긴다 (PERF_LOG_MAX 넘으면 .1 로 돌림).
+# 꺼져 있으면 phase() 는 nullcontext, 카운터는 현재 스레드에 프로파일러가 없어 바로 빠진다.
+
+PERF_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "perf.jsonl")
+PERF_LOG_MAX = 5 * 1024 * 1024
+
+_local = threading.local()
+_log_lock = threading.Lock()
+_patched = False
+
+
+class Profiler:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.phases = []        # [(이름, ms, 중첩 깊이)] - 끝난 순서대로
+        self.depth = 0
+        self.counts = {}        # "api: ..." / "cache call: ..." / "cache miss: ..." → 횟수
+
+    def count(self, key, n=1):
+        self.counts[key] = self.counts.get(key, 0) + n
+
+    def record(self):
+        total = (time.perf_counter() - self.started) * 1000
+        phases = {}
+        for name, ms, _ in self.phases:
+            phases[name] = round(phases.get(name, 0.0) + ms, 2)
+        top = sum(ms for _, ms, depth in self.phases if depth == 0)   # 중첩 구간 (load 안의 connect 등) 은 두 번 세지 않는다
+        return {
+            "ts": round(time.time(), 3),
+            "page": self.page,
+            "total_ms": round(total, 2),
+            "other_ms": round(max(total - top, 0.0), 2),
+            "phases": phases,
+            "counts": dict(sorted(self.counts.items())),
+        }
+
+
+def current():
+    return getattr(_local, "prof", None)
+
+
+def start(page, enabled):
+    _local.prof = Profiler(page) if enabled else None
+    if enabled:
+        _patch_gspread()
+    return _local.prof
+
+
+@contextmanager
+def _timed(prof, name):
+    t0 = time.perf_counter()
+    prof.depth += 1
+    try:
+        yield
+    finally:
+        prof.depth -= 1
+        prof.phases.append((name, (time.perf_counter() - t0) * 1000, prof.depth))
+
+
+def phase(name):
+    prof = current()
+    return _timed(prof, name) if prof is not None else nullcontext()
+
+
+def count(key, n=1):
+    prof = current()
+    if prof is not None:
+        prof.count(key, n)
+
+
+def cached(cache_decorator):
+    # @perf.cached(st.cache_data(...)) - 호출 수와 (본문이 실제로 돈) 미스 수를 센다. .clear() 는 그대로 쓸 수 있다
+    def deco(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            count(f"cache miss: {fn.__name__}")
+            return fn(*args, **kwargs)
+        cached_fn = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            count(f"cache call: {fn.__name__}")
+            return cached_fn(*args, **kwargs)
+        call.clear = cached_fn.clear
+        return call
+    return deco
+
+
+_VERB_RE = re.compile(r":(append|clear|batch\w+)$")
+
+
+def endpoint_kind(method, url):
+    # ".../spreadsheets/ID/values/'탭'!A1:F" → "GET spreadsheets/values", ":batchGet" 같은 동사는 뒤에 붙인다
+    path = urllib.parse.urlsplit(str(url)).path
+    kind = "drive files" if "/drive/" in path else "spreadsheets"
+    if "/values" in path:
+        kind += "/values"
+    verb = _VERB_RE.search(path)
+    return f"{method.upper()} {kind}" + (":" + verb.group(1) if verb else "")
+
+
+def _patch_gspread():
+    global _patched
+    if _patched:
+        return
+    from gspread.http_client import HTTPClient
+    original = HTTPClient.request
+
+    def request(self, method, endpoint, *args, **kwargs):
+        count("api: " + endpoint_kind(method, endpoint))
+        return original(self, method, endpoint, *args, **kwargs)
+    HTTPClient.request = request
+    _patched = True
+
+
+def finish():
+    # 이번 rerun 기록을 로그에 남기고 돌려준다 (꺼져 있으면 None)
+    prof = current()
+    _local.prof = None
+    if prof is None:
+        return None
+    rec = prof.record()
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(PERF_LOG), exist_ok=True)
+            if os.path.exists(PERF_LOG) and os.path.getsize(PERF_LOG) > PERF_LOG_MAX:
+                os.replace(PERF_LOG, PERF_LOG + ".1")
+            with open(PERF_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"성능 로그 저장 실패: {e}")
+    return rec
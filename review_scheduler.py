@@ -0,0 +1,230 @@
+import heapq
+import os
+import random
+import re
+import sqlite3
+from collections import deque
+from contextlib import closing
+
+# --- [학습 모드 복습 스케줄러 (사용자별, SQLite)] ---
+# 카드(uid)마다 다음 복습 시각(due)과 간격/난이도를 사용자별로 저장해 두고,
+# 덱(전체 또는 분류 하나)마다 "복습할 때가 된 카드" 힙 + 아직 안 본 새 카드 큐를 들고 있다가
+# 학습 화면에는 다음 REVIEW_BATCH 장만 보낸다 (5만 문장 덱이어도 수십 장만 전송/렌더).
+#   - 다시(again): RELEARN_DELAY 초 뒤 다시 나옴, 틀린 횟수(lapses) +1, 쉬움 정도(ease) -0.2
+#   - 알았음(good): 1일 → 6일 → 간격 × ease
+#   - 쉬움(easy): good 간격 × EASY_BONUS, ease +0.15
+# 내보낸 카드는 답을 받기 전까지 LEASE 초 동안 다시 내보내지 않는다 (창을 닫으면 그 뒤 다시 나온다).
+# 같은 사용자의 덱들은 기록(records)을 공유하고, 힙 항목은 꺼낼 때 기록의 due 와 대조한다 (지연 갱신).
+# 데이터 버전이 바뀌면 덱을 새로 만들지 않고 uid 차이만 반영한다 (내보낸 카드의 LEASE 와 섞인 순서 유지).
+# 카드 ID 는 행 내용 해시라서 앱에서 고친 행은 rename_uids 로 기록을 새 uid 로 옮긴다 (시트에서 직접 고친 행은 새 카드가 된다).
+# 학습 화면은 로그인 없이 열리므로 사용자/창 id 는 형식을 검사하고, 기록을 남기는 사용자 수는 USERS_MAX 로 묶는다.
+
+REVIEW_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+REVIEW_DB = os.path.join(REVIEW_DIR, "review.sqlite")
+
+REVIEW_BATCH = 30
+RELEARN_DELAY = 60
+LEASE = 600
+EASY_BONUS = 1.3
+DAY = 86400
+GRADES = ("again", "good", "easy")
+QUEUES_MAX = 32   # (사용자, 덱) 큐를 이만큼만 메모리에 (오래된 것부터 버린다 - 기록은 SQLite 에 있다)
+ACKED_MAX = 256   # 답 확인 번호를 기억해 두는 (사용자, 창) 수 - 오래 안 온 창부터 버린다
+USERS_MAX = 200   # SQLite 에 기록을 남기는 사용자(브라우저) 수 상한
+_ID = re.compile(r"[a-z0-9]{1,40}")
+
+
+def valid_id(s):
+    # 브라우저가 만든 사용자/창 id (영소문자+숫자) 만 받는다
+    return isinstance(s, str) and _ID.fullmatch(s) is not None
+
+
+def _connect():
+    os.makedirs(REVIEW_DIR, exist_ok=True)
+    con = sqlite3.connect(REVIEW_DB, timeout=10)
+    con.execute("CREATE TABLE IF NOT EXISTS review (user TEXT NOT NULL, uid TEXT NOT NULL, due REAL NOT NULL, interval REAL NOT NULL, "
+                "ease REAL NOT NULL, reps INTEGER NOT NULL, lapses INTEGER NOT NULL, PRIMARY KEY (user, uid))")
+    con.execute("CREATE INDEX IF NOT EXISTS review_uid ON review (uid)")
+    return con
+
+
+def load_user(user):
+    # uid → {"due", "interval"(일), "ease", "reps", "lapses"}
+    if not os.path.exists(REVIEW_DB):
+        return {}
+    try:
+        with closing(_connect()) as con:
+            rows = con.execute("SELECT uid, due, interval, ease, reps, lapses FROM review WHERE user = ?", (user,)).fetchall()
+        return {r[0]: {"due": r[1], "interval": r[2], "ease": r[3], "reps": r[4], "lapses": r[5]} for r in rows}
+    except Exception as e:
+        print(f"복습 기록 읽기 실패 ({user}): {e}")
+        return {}
+
+
+def save_user(user, records):
+    # records: {uid: 기록} - 바뀐 카드만 한 트랜잭션으로. 처음 보는 사용자는 USERS_MAX 명까지만
+    try:
+        with closing(_connect()) as con, con:
+            if con.execute("SELECT 1 FROM review WHERE user = ? LIMIT 1", (user,)).fetchone() is None and \
+                    con.execute("SELECT COUNT(DISTINCT user) FROM review").fetchone()[0] >= USERS_MAX:
+                print(f"복습 기록 저장 안 함 ({user}): 사용자 수 상한 {USERS_MAX}")
+                return False
+            con.executemany("INSERT OR REPLACE INTO review (user, uid, due, interval, ease, reps, lapses) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [(user, uid, r["due"], r["interval"], r["ease"], r["reps"], r["lapses"]) for uid, r in records.items()])
+        return True
+    except Exception as e:
+        print(f"복습 기록 저장 실패 ({user}): {e}")
+        return False
+
+
+def rename_uids(registry, renames):
+    # renames: [(옛 uid, 새 uid)] - 앱에서 고친 행. 메모리의 기록과 SQLite 의 모든 사용자 기록을 옮긴다
+    for records in registry["users"].values():
+        for old, new in renames:
+            if old in records:
+                records[new] = records.pop(old)
+    if not os.path.exists(REVIEW_DB):
+        return
+    try:
+        with closing(_connect()) as con, con:
+            con.executemany("UPDATE OR REPLACE review SET uid = ? WHERE uid = ?", [(new, old) for old, new in renames])
+    except Exception as e:
+        print(f"복습 기록 uid 변경 실패: {e}")
+
+
+def schedule(rec, grade, now):
+    # 답 하나 → 새 기록 (rec 가 None 이면 처음 본 카드)
+    rec = dict(rec or {"due": 0.0, "interval": 0.0, "ease": 2.5, "reps": 0, "lapses": 0})
+    if grade == "again":
+        rec.update(interval=0.0, reps=0, lapses=rec["lapses"] + 1, ease=max(1.3, rec["ease"] - 0.2), due=now + RELEARN_DELAY)
+        return rec
+    interval = 1.0 if rec["reps"] == 0 else (6.0 if rec["reps"] == 1 else rec["interval"] * rec["ease"])
+    if grade == "easy":
+        interval *= EASY_BONUS
+        rec["ease"] += 0.15
+    rec.update(interval=interval, reps=rec["reps"] + 1, due=now + interval * DAY)
+    return rec
+
+
+class ReviewQueue:
+    def __init__(self, records, uids, version, rng=None):
+        self.records = records      # 같은 사용자의 다른 덱과 공유
+        self.version = version
+        self.uids = set(uids)
+        self.sched = {}             # uid → 힙에 넣은 현재 due (힙에는 지난 항목이 남아 있을 수 있다 → 꺼낼 때 이것과 대조)
+        self.heap = []
+        for u in uids:
+            if u in records:
+                self.sched[u] = records[u]["due"]
+                self.heap.append((records[u]["due"], u))
+        heapq.heapify(self.heap)
+        fresh = [u for u in uids if u not in records]
+        (rng or random).shuffle(fresh)
+        self.fresh = deque(fresh)
+
+    def reconcile(self, uids, version, rng=None):
+        # 데이터 버전이 바뀌었을 때 - 빠진 카드는 버리고 (힙 항목은 꺼낼 때 걸러진다), 들어온 카드만 더한다
+        new = set(uids)
+        gone = self.uids - new
+        for u in gone:
+            self.sched.pop(u, None)
+        if gone:
+            self.fresh = deque(u for u in self.fresh if u not in gone)
+        fresh = []
+        for u in uids:
+            if u in self.uids:
+                continue
+            if u in self.records:
+                self._push(u, self.records[u]["due"])
+            else:
+                fresh.append(u)
+        (rng or random).shuffle(fresh)
+        self.fresh.extend(fresh)   # 새로 생긴 카드는 아직 안 본 카드들 뒤에
+        self.uids = new
+        self.version = version
+
+    def _push(self, uid, due):
+        self.sched[uid] = due
+        heapq.heappush(self.heap, (due, uid))
+
+    def _due(self, uid):
+        rec = self.records.get(uid)
+        return rec["due"] if rec else 0.0
+
+    def next_batch(self, k, now):
+        # 때가 된 복습 카드 먼저 (due 순), 모자라면 새 카드. 내보낸 카드는 LEASE 뒤로 다시 넣어 둔다
+        out = []
+        while self.heap and len(out) < k and self.heap[0][0] <= now:
+            due, uid = heapq.heappop(self.heap)
+            if self.sched.get(uid) != due or uid in out:   # 빠졌다 다시 들어온 카드는 같은 항목이 둘일 수 있다
+                continue
+            cur = self._due(uid)
+            if cur > due:   # 그 사이 다른 덱에서 답을 받아 미뤄진 카드
+                self._push(uid, cur)
+                continue
+            out.append(uid)
+        while self.fresh and len(out) < k:
+            uid = self.fresh.popleft()
+            if uid in self.records:   # 다른 덱에서 이미 본 카드 → 복습 힙으로
+                self._push(uid, self._due(uid))
+                continue
+            out.append(uid)
+        for uid in out:
+            self._push(uid, now + LEASE)
+        return out
+
+    def grade(self, graded, now):
+        # graded: [(uid, "again"|"good"|"easy")] → 바뀐 기록 {uid: 기록} (저장은 호출하는 쪽에서 save_user 로)
+        changed = {}
+        for uid, g in graded:
+            if g not in GRADES:
+                continue
+            rec = schedule(self.records.get(uid), g, now)
+            self.records[uid] = changed[uid] = rec
+            if uid in self.sched:
+                self._push(uid, rec["due"])
+        return changed
+
+    def remaining(self, now):
+        # (지금 복습할 카드 수, 새 카드 수, 다음 복습 시각 또는 None)
+        due = sum(1 for u, d in self.sched.items() if d <= now and self._due(u) <= d)
+        upcoming = min((d for d in self.sched.values() if d > now), default=None)
+        return due, len(self.fresh), upcoming
+
+
+def new_registry():
+    return {"users": {}, "queues": {}, "acked": {}}
+
+
+def fresh_grades(registry, user, client, graded):
+    # 브라우저는 확인(ack)받기 전까지 답을 [번호, uid, 답] 으로 매번 다시 보낸다 → 이미 반영한 번호는 건너뛴다
+    # 번호는 창(client)마다 따로 센다 - 같은 사용자가 창 두 개로 복습해도 서로의 답을 지우지 않는다
+    graded = [g for g in graded if isinstance(g, list) and len(g) == 3 and isinstance(g[0], int) and isinstance(g[1], str) and isinstance(g[2], str)]
+    key = (user, client)
+    last = registry["acked"].pop(key, 0)
+    out = [(g[1], g[2]) for g in graded if g[0] > last]
+    ack = registry["acked"][key] = max([last] + [g[0] for g in graded])
+    while len(registry["acked"]) > ACKED_MAX:
+        del registry["acked"][next(iter(registry["acked"]))]
+    return out, ack
+
+
+def queue_for(registry, user, deck, uids_fn, version):
+    # 데이터 버전이 바뀌면 (행 추가/삭제/수정) 덱의 uid 차이만 반영한다. uids_fn() 은 덱을 만들거나 맞출 때만 부른다
+    records = registry["users"].get(user)
+    if records is None:
+        records = registry["users"][user] = load_user(user)
+    key = (user, deck)
+    q = registry["queues"].pop(key, None)
+    if q is None:
+        q = ReviewQueue(records, uids_fn(), version)
+    elif q.version != version:
+        q.reconcile(uids_fn(), version)
+    registry["queues"][key] = q
+    while len(registry["queues"]) > QUEUES_MAX:
+        old_user = next(iter(registry["queues"]))[0]
+        del registry["queues"][next(iter(registry["queues"]))]
+        if all(u != old_user for u, _ in registry["queues"]):
+            registry["users"].pop(old_user, None)
+    return q
+
@@ -0,0 +1,420 @@
+import hashlib
+import json
+import re
+import time
+import concurrent.futures
+from bisect import bisect_left
+
+import pandas as pd
+from gspread.utils import absolute_range_name
+
+# --- [English_Sentences 증분 동기화] ---
+# 시트별 원본 행(rows) + 지문(fp)을 보관해 두고, TTL 만료 때마다
+#   1) 드라이브 수정시각이 그대로면 → 시트 읽기 0회
+#   2) 바뀌었으면 → 알고 있는 시트마다 머리(앞 SYNC_PROBE_ROWS행) + 꼬리(마지막 SYNC_PROBE_ROWS행~끝)만 batchGet 한 번으로 읽어
+#      둘 다 그대로면 뒤에 추가된 행만 이어 붙이고, 머리나 꼬리가 달라진 시트만 전체 재조회
+#      (머리/꼬리 사이의 중간 행을 다른 사람이 고친 것은 3) 의 전체 대조 때 반영된다 - 앱에서 고친 행은 쓰기 때 바로 반영)
+#   3) 수정시각을 못 읽었거나 SYNC_FULL_INTERVAL 경과 시 → 전체 대조
+# 변경된 시트의 프레임만 다시 만들어 캐시 DataFrame에 합친다.
+
+ENG_COLS = ['분류', '단어-문장', '해석', '발음', '메모1', '메모2']
+ENG_FRAME_COLS = ENG_COLS + ['sheet_idx', 'row_idx', 'uid']
+CATEGORY_COLS = ['분류', 'sheet_idx']   # 값 종류가 적은 열 → category (행마다 같은 문자열 객체를 들지 않는다). 나머지 글자 열은 Arrow 문자열
+LINK_COLS = ['대분류', '소분류', '제목', '메모', '링크']
+
+SYNC_PROBE_ROWS = 50       # 머리/꼬리 확인 때 읽는 기존 행 수 (앞부분·끝부분 수정/삭제 감지용)
+SYNC_FULL_INTERVAL = 3600  # 이 주기(초)마다 한 번은 전체 대조 → 놓친 중간 수정 보정
+
+
+def is_english_sheet(title):
+    return title != "링크" and "임시" not in title
+
+
+def normalize_rows(values, width=6):
+    # 헤더 제외 원본 값 → 고정 폭 + strip, 끝의 빈 행 제거 (get_all_values / batchGet 결과를 같은 모양으로)
+    rows = [[str(c).strip() for c in (row[:width] + [""] * (width - len(row[:width])))] for row in values]
+    while rows and not any(rows[-1]):
+        rows.pop()
+    return rows
+
+
+def rows_fingerprint(rows):
+    return hashlib.sha1(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def row_uids(scope, rows):
+    # ★ 행 ID - (시트, 행 내용, 같은 내용 중 몇 번째) 의 해시. 행 번호와 무관해 위쪽 행이 추가/삭제돼도 그대로다
+    # 세션에 들고 있는 행(랜덤 10, 열린 수정창, 그리드 클릭)은 uid 로 현재 행 번호를 다시 찾는다
+    # 내용 주소라서 한계가 있다 (시트에 ID 열이 없다):
+    #   - 칸 하나라도 고치면 다른 행이 된다 → 들고 있던 uid 는 못 찾는다 (수정창은 "바뀐 행" 으로 막고, 랜덤 10 은 follow_random_uid 로 잇는다)
+    #   - 같은 내용의 행이 여럿이면 몇 번째인지가 ID 에 들어가므로, 그중 앞쪽 행을 지우면 뒤쪽 행의 uid 가 앞 행의 것으로 바뀐다
+    seen, out = {}, []
+    for r in rows:
+        key = "\x1f".join(r)
+        k = seen.get(key, 0)
+        seen[key] = k + 1
+        out.append(hashlib.sha1(f"{scope}\x1e{key}\x1e{k}".encode('utf-8')).hexdigest()[:12])
+    return out
+
+
+def rows_to_frame(sheet_name, rows):
+    if not rows:
+        return pd.DataFrame(columns=ENG_FRAME_COLS)
+    df = pd.DataFrame(rows, columns=ENG_COLS)
+    df['uid'] = row_uids(sheet_name, rows)
+    df = df[df['단어-문장'] != ""]
+    df['sheet_idx'] = sheet_name
+    df['row_idx'] = df.index + 2
+    return df[ENG_FRAME_COLS]
+
+
+def links_frame(rows):
+    if not rows:
+        df = pd.DataFrame(columns=LINK_COLS + ['row_idx', 'uid'])
+    else:
+        df = pd.DataFrame(rows, columns=LINK_COLS)
+        df['row_idx'] = df.index + 2
+        df['uid'] = row_uids("링크", rows)
+    df.attrs["version"] = rows_fingerprint(rows)[:16]
+    return df
+
+
+def new_sync_state():
+    return {
+        "sheets": {},        # title → {"rows", "n"(행 수), "fp", "frame"}
+        "order": [],         # 워크북의 시트 순서
+        "modified": None,    # 마지막으로 반영한 드라이브 modifiedTime
+        "checked_at": 0.0,
+        "full_at": 0.0,
+        "force_full": False,
+        "df": pd.DataFrame(columns=ENG_FRAME_COLS),
+        "version": None,
+        "derived": {},       # 데이터 버전에 묶인 파생 색인 (검색 등) - 쓰기 시 증분 갱신
+        "renamed": [],       # 쓰기로 고친 행의 (옛 uid, 새 uid) - 앱이 가져가 복습 기록을 옮긴다
+    }
+
+
+def _set_sheet(state, title, rows):
+    fp = rows_fingerprint(rows)
+    old = state["sheets"].get(title)
+    if old is not None and old["fp"] == fp:
+        return False
+    state["sheets"][title] = {"rows": rows, "n": len(rows), "fp": fp, "frame": rows_to_frame(title, rows)}
+    return True
+
+
+def _merge(state):
+    frames = [state["sheets"][t]["frame"] for t in state["order"] if t in state["sheets"]]
+    frames = [f for f in frames if not f.empty]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ENG_FRAME_COLS)
+    state["df"] = df.astype({c: 'category' for c in CATEGORY_COLS})
+    state["version"] = hashlib.sha1("|".join(f"{t}:{state['sheets'][t]['fp']}" for t in state["order"] if t in state["sheets"]).encode('utf-8')).hexdigest()[:16]
+    # 캐시 복사본(st.cache_data)에도 따라가도록 DataFrame 자체에 버전을 붙여 둔다
+    state["df"].attrs["version"] = state["version"]
+
+
+SYNC_FIELDS = ("sheets", "order", "df", "version", "modified", "checked_at", "full_at", "force_full")
+
+
+def copy_state(state):
+    # 잠금 밖에서 동기화할 작업본 - 시트 항목/행 목록은 고치지 않고 바꿔 끼우기만 하므로 sheets 사전만 복사
+    work = {k: state[k] for k in SYNC_FIELDS}
+    work["sheets"] = dict(state["sheets"])
+    return work
+
+
+def adopt_state(state, work):
+    for k in SYNC_FIELDS:
+        state[k] = work[k]
+
+
+def export_state(state):
+    # 스냅샷 저장용 - 원본 행과 그 행들이 맞춰진 수정시각만 보관 (프레임/지문은 복원 시 재계산)
+    return {
+        "order": state["order"],
+        "modified": state["modified"],
+        "checked_at": state["checked_at"],
+        "full_at": state["full_at"],
+        "sheets": {t: e["rows"] for t, e in state["sheets"].items()},
+    }
+
+
+def restore_state(state, payload):
+    state["sheets"] = {}
+    for t, rows in payload["sheets"].items():
+        _set_sheet(state, t, rows)
+    state["order"] = payload["order"]
+    state["modified"] = payload["modified"]
+    state["checked_at"] = payload["checked_at"]
+    state["full_at"] = payload.get("full_at", 0.0)
+    _merge(state)
+
+
+def fetch_sheet_rows(wb, sheet_name):
+    data = wb.worksheet(sheet_name).get_all_values()
+    return normalize_rows(data[1:]) if data else []
+
+
+def fetch_rows_threaded(wb, titles):
+    # 시트별 worksheet() + get_all_values() → API 호출 2×N (이전 방식, batchGet 실패 시 대체 경로)
+    out = {}
+    if not titles:
+        return out
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(5, len(titles))) as executor:
+        # lambda 대신 직접 함수 참조로 클로저 문제 방지
+        futures = {executor.submit(fetch_sheet_rows, wb, name): name for name in titles}
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                out[name] = future.result()
+            except Exception as e:
+                print(f"Error loading sheet {name}: {e}")
+    return out
+
+
+def fetch_rows_batch(wb, titles):
+    # ★ 이미 알고 있는 시트 이름으로 values:batchGet 1회 - 시트 수와 상관없이 API 호출 1번
+    if not titles:
+        return {}
+    res = wb.values_batch_get([absolute_range_name(t, "A:F") for t in titles])
+    return {t: normalize_rows(vr.get("values", [])[1:]) for t, vr in zip(titles, res.get("valueRanges", []))}
+
+
+def _fetch_full(wb, titles):
+    # 실패한 시트는 결과에서 빠지고 이전 값이 유지된다
+    try:
+        return fetch_rows_batch(wb, titles)
+    except Exception as e:
+        print(f"batchGet 실패 → 시트별 조회로 대체: {e}")
+        return fetch_rows_threaded(wb, titles)
+
+
+def _trim(rows):
+    # 시트 API 는 범위 끝의 빈 행을 돌려주지 않는다 → 비교할 기존 행도 같은 모양으로
+    rows = list(rows)
+    while rows and not any(rows[-1]):
+        rows.pop()
+    return rows
+
+
+def _probe_sheets(wb, state, titles):
+    # 시트마다 머리 A2:F{1+P} 와 꼬리 A{n+2-P}:F 를 batchGet 1회로 읽는다 (행 수 n 이 작으면 꼬리 하나로 전체)
+    # 머리·꼬리가 저장된 행과 같으면 꼬리 뒤에 붙은 행만 반영하고, 다른 시트는 전체 재조회 대상으로 돌려준다
+    ranges, plan = [], []
+    for t in titles:
+        n = state["sheets"][t]["n"]
+        start = max(0, n - SYNC_PROBE_ROWS)
+        head = start > SYNC_PROBE_ROWS
+        if head:
+            ranges.append(absolute_range_name(t, f"A2:F{SYNC_PROBE_ROWS + 1}"))
+        ranges.append(absolute_range_name(t, f"A{start + 2}:F"))
+        plan.append((t, start, head))
+    res = iter(wb.values_batch_get(ranges).get("valueRanges", []))
+    changed, stale = False, []
+    for t, start, head in plan:
+        rows = state["sheets"][t]["rows"]
+        head_ok = not head or normalize_rows(next(res, {}).get("values", [])) == _trim(rows[:SYNC_PROBE_ROWS])
+        tail = normalize_rows(next(res, {}).get("values", []))
+        old_tail = rows[start:]
+        if not head_ok or tail[:len(old_tail)] != old_tail:
+            stale.append(t)
+        elif len(tail) > len(old_tail):
+            changed |= _set_sheet(state, t, rows + tail[len(old_tail):])
+    return changed, stale
+
+
+def sync_english_book(wb, state):
+    now = time.time()
+    try:
+        modified = wb.get_lastUpdateTime()
+    except Exception as e:
+        print(f"modifiedTime 조회 실패: {e}")
+        modified = None
+
+    full = state["force_full"] or not state["sheets"] or now - state["full_at"] > SYNC_FULL_INTERVAL
+    if not full and modified is not None and modified == state["modified"]:
+        state["checked_at"] = now
+        return False
+
+    titles = [ws.title for ws in wb.worksheets() if is_english_sheet(ws.title)]
+    removed = [t for t in state["sheets"] if t not in titles]
+    for t in removed:
+        del state["sheets"][t]
+    changed = bool(removed) or titles != state["order"]
+    state["order"] = titles
+
+    refetch = titles if full else [t for t in titles if t not in state["sheets"]]
+    known = [t for t in titles if t in state["sheets"]]
+    if not full and known:
+        try:
+            probe_changed, stale = _probe_sheets(wb, state, known)
+            changed |= probe_changed
+            refetch += stale
+        except Exception as e:
+            print(f"머리/꼬리 확인 실패 → 전체 대조: {e}")
+            refetch = titles
+
+    fetched = _fetch_full(wb, refetch)
+    for t, rows in fetched.items():
+        changed |= _set_sheet(state, t, rows)
+
+    if changed or state["version"] is None:
+        _merge(state)
+    # 일부 시트 조회가 실패했으면 수정시각을 반영하지 않아 다음 확인 때 다시 시도한다
+    if len(fetched) == len(refetch):
+        state["modified"] = modified
+        if full or set(refetch) >= set(titles):
+            state["full_at"] = now
+            state["force_full"] = False
+    state["checked_at"] = now
+    return changed
+
+
+# --- [쓰기 직후 캐시 직접 반영 (write-through)] ---
+# append_row / update / delete_rows 를 보낸 뒤 같은 변경을 캐시의 원본 행에 적용한다.
+# 행 번호(row_idx)는 원본 행 위치에서 다시 계산되므로 삭제 후 아래 행들은 자동으로 한 칸씩 당겨진다.
+
+def appended_row_idx(res):
+    # append 응답의 updatedRange ("'시트'!A123:F123") 에서 실제로 들어간 행 번호를 읽는다 (못 읽으면 None → 맨 끝)
+    try:
+        return int(re.search(r"![A-Z]+(\d+)", res["updates"]["updatedRange"]).group(1))
+    except Exception:
+        return None
+
+
+def patch_rows(rows, op, row_idx, values=None, width=6):
+    rows = list(rows)
+    if row_idx is None:
+        row_idx = len(rows) + 2
+    pos = max(row_idx - 2, 0)
+    if op == "delete":
+        if 0 <= pos < len(rows):
+            del rows[pos]
+    else:
+        row = normalize_rows([list(values)], width)
+        row = row[0] if row else [""] * width
+        while len(rows) < pos:
+            rows.append([""] * width)
+        # append 도 기존 범위 안이면 덮어쓴다 - values.append 는 표 중간의 빈 행에 써 넣을 뿐 행을 끼워 넣지 않는다
+        if pos == len(rows):
+            rows.append(row)
+        else:
+            rows[pos] = row
+    while rows and not any(rows[-1]):
+        rows.pop()
+    return rows
+
+
+def _frame_pos(frame, row_idx):
+    # 시트 프레임 안에서 row_idx 행의 위치와 존재 여부 (빈 '단어-문장' 행은 프레임에 없다)
+    ri = frame['row_idx'].to_numpy()
+    i = int(ri.searchsorted(row_idx))
+    return i, i < len(ri) and ri[i] == row_idx
+
+
+def patch_english(state, sheet_name, op, row_idx, values=None):
+    # 합쳐진 DataFrame 기준 변경 목록 [("delete", pos) | ("insert", pos)] 를 돌려준다 (파생 색인 증분 갱신용)
+    entry = state["sheets"].get(sheet_name)
+    if entry is None:
+        # 아직 모르는 시트 → 다음 동기화에서 다시 읽도록 수정시각만 비워 둔다
+        state["modified"] = None
+        return None
+    if row_idx is None:
+        row_idx = len(entry["rows"]) + 2
+    base = sum(len(state["sheets"][t]["frame"]) for t in state["order"][:state["order"].index(sheet_name)] if t in state["sheets"])
+    i, old_present = _frame_pos(entry["frame"], row_idx)
+    if not _set_sheet(state, sheet_name, patch_rows(entry["rows"], op, row_idx, values)):
+        return []
+    _merge(state)
+    frame = state["sheets"][sheet_name]["frame"]
+    j, new_present = _frame_pos(frame, row_idx)
+    if op == "update" and old_present and new_present:
+        state["renamed"].append((entry["frame"]['uid'].iat[i], frame['uid'].iat[j]))
+    ops = []
+    if old_present:
+        ops.append(("delete", base + i))
+    if op != "delete" and new_present:
+        ops.append(("insert", base + j))
+    return ops
+
+
+def append_english(state, sheet_name, row_idx, rows):
+    # 여러 행을 한 번에 추가 (append_rows 응답 기준 첫 행 번호) - 지문/병합은 한 번만
+    # ops: 덮어쓴 자리에 있던 행 delete (내림차순) → 새 행 insert (오름차순)
+    entry = state["sheets"].get(sheet_name)
+    if entry is None:
+        state["modified"] = None
+        return None
+    if row_idx is None:
+        row_idx = len(entry["rows"]) + 2
+    base = sum(len(state["sheets"][t]["frame"]) for t in state["order"][:state["order"].index(sheet_name)] if t in state["sheets"])
+    pos = max(row_idx - 2, 0)
+    new_rows = list(entry["rows"])
+    while len(new_rows) < pos:
+        new_rows.append([""] * 6)
+    new_rows[pos:pos + len(rows)] = [(normalize_rows([list(v)]) or [[""] * 6])[0] for v in rows]   # 범위 안의 빈 행은 덮어쓴다 (patch_rows 와 같음)
+    while new_rows and not any(new_rows[-1]):
+        new_rows.pop()
+    if not _set_sheet(state, sheet_name, new_rows):
+        return []
+    _merge(state)
+    old = entry["frame"]['row_idx'].to_numpy()
+    olo, ohi = int(old.searchsorted(row_idx)), int(old.searchsorted(row_idx + len(rows)))
+    ri = state["sheets"][sheet_name]["frame"]['row_idx'].to_numpy()
+    lo, hi = int(ri.searchsorted(row_idx)), int(ri.searchsorted(row_idx + len(rows)))
+    return [("delete", base + i) for i in range(ohi - 1, olo - 1, -1)] + [("insert", base + j) for j in range(lo, hi)]
+
+
+def edit_english(state, sheet_name, updates, deletes):
+    # 여러 행 수정({row_idx: 값}) / 삭제([row_idx]) 를 한 번에 - row_idx 는 모두 변경 전 기준
+    # ops: 건드린 기존 행 delete (내림차순) → 수정된 행 insert (최종 위치 오름차순)
+    entry = state["sheets"].get(sheet_name)
+    if entry is None:
+        state["modified"] = None
+        return None
+    base = sum(len(state["sheets"][t]["frame"]) for t in state["order"][:state["order"].index(sheet_name)] if t in state["sheets"])
+    dels = sorted(set(deletes))
+    old_at = {r: _frame_pos(entry["frame"], r) for r in sorted(set(updates) | set(dels))}
+    old_pos = [i for i, present in old_at.values() if present]
+    new_rows = list(entry["rows"])
+    for r, values in updates.items():
+        pos = max(r - 2, 0)
+        while len(new_rows) <= pos:
+            new_rows.append([""] * 6)
+        new_rows[pos] = (normalize_rows([list(values)]) or [[""] * 6])[0]
+    for r in reversed(dels):
+        if 0 <= r - 2 < len(new_rows):
+            del new_rows[r - 2]
+    while new_rows and not any(new_rows[-1]):
+        new_rows.pop()
+    if not _set_sheet(state, sheet_name, new_rows):
+        return []
+    _merge(state)
+    frame = state["sheets"][sheet_name]["frame"]
+    new_pos = []
+    for r in updates:
+        if r in deletes:
+            continue
+        j, present = _frame_pos(frame, r - bisect_left(dels, r))
+        if present:
+            new_pos.append(j)
+            if old_at[r][1]:
+                state["renamed"].append((entry["frame"]['uid'].iat[old_at[r][0]], frame['uid'].iat[j]))
+    return [("delete", base + i) for i in sorted(old_pos, reverse=True)] + [("insert", base + j) for j in sorted(new_pos)]
+
+
+def edit_diff(before, after, width=6):
+    # 표 편집 전/후 (같은 index, 앞 width 열 = 시트 열) → {시트: {"update": {row_idx: 값}, "delete": [row_idx]}}, 바뀐 셀 수
+    cols = list(before.columns[:width])
+    gone = before.index.difference(after.index)
+    kept = before.index.intersection(after.index)
+    old = before.loc[kept, cols].astype(str).to_numpy()
+    new = after.loc[kept, cols].fillna("").astype(str).to_numpy()
+    cell_mask = old != new
+    changed = kept[cell_mask.any(axis=1)]
+    out = {}
+    for key in gone:
+        out.setdefault(before.at[key, 'sheet_idx'], {"update": {}, "delete": []})["delete"].append(int(before.at[key, 'row_idx']))
+    for key in changed:
+        out.setdefault(before.at[key, 'sheet_idx'], {"update": {}, "delete": []})["update"][int(before.at[key, 'row_idx'])] = [str(v).strip() for v in after.loc[key, cols].fillna("")]
+    return out, int(cell_mask.sum())
@@ -0,0 +1,46 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+
+# --- [로컬 스냅샷 저장소 (SQLite)] ---
+# 시트에서 마지막으로 성공한 조회 결과를 이름별로 한 줄씩 저장해 두고,
+# 프로세스 재시작/캐시 삭제 후 첫 화면을 구글 시트 조회 없이 바로 그린다.
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+SNAPSHOT_DB = os.path.join(SNAPSHOT_DIR, "snapshot.sqlite")
+
+
+def _connect():
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    con = sqlite3.connect(SNAPSHOT_DB, timeout=10)
+    con.execute("CREATE TABLE IF NOT EXISTS snapshot (name TEXT PRIMARY KEY, saved_at REAL NOT NULL, payload BLOB NOT NULL)")
+    return con
+
+
+def save(name, payload):
+    try:
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'), 6)
+        with closing(_connect()) as con, con:
+            con.execute("INSERT OR REPLACE INTO snapshot (name, saved_at, payload) VALUES (?, ?, ?)", (name, time.time(), blob))
+        return True
+    except Exception as e:
+        print(f"스냅샷 저장 실패 ({name}): {e}")
+        return False
+
+
+def load(name):
+    # (payload, saved_at) 또는 None
+    if not os.path.exists(SNAPSHOT_DB):
+        return None
+    try:
+        with closing(_connect()) as con:
+            row = con.execute("SELECT payload, saved_at FROM snapshot WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode('utf-8')), row[1]
+    except Exception as e:
+        print(f"스냅샷 읽기 실패 ({name}): {e}")
+        return None
@@ -0,0 +1,170 @@
+import copy
+
+import numpy as np
+
+# --- [문자 n-gram 역색인 (목록 내 검색용)] ---
+# 행마다 검색 대상 컬럼을 소문자로 이어 붙인 텍스트에서 글자 1-gram / 2-gram 을 뽑아
+# gram → 행 위치(정렬된 int32 배열) 로 색인한다. 한글도 글자 단위라 부분 문자열 검색이 그대로 된다.
+#   - 1글자 검색: 1-gram 목록 그대로
+#   - 2글자 검색: 2-gram 목록 그대로
+#   - 3글자 이상: 3-gram 위치 색인 - 3-gram 마다 (전체 텍스트 안의) 나온 위치 목록을 두고, 검색어를 덮는 3-gram 들의
+#     위치를 검색어 안 오프셋만큼 당겨 교집합 → 그대로 일치 위치라 행마다 부분 문자열을 다시 확인하지 않는다
+# 쓰기(추가/수정/삭제)는 전체 재색인 없이 반영한다: 기존 행은 base 위치 → 현재 위치 매핑으로 옮기고,
+# 새로 들어온 행은 overlay 로 따로 들고 있다가 OVERLAY_REBUILD 개를 넘으면 한 번에 다시 만든다.
+
+SEP = "\x00"            # 컬럼/행 구분자 - 검색어에는 나올 수 없어 컬럼을 넘나드는 매치가 생기지 않는다
+OVERLAY_REBUILD = 1000
+
+
+def row_texts(df, cols):
+    if df.empty:
+        return []
+    joined = df[cols[0]].astype(str).str.lower()
+    for c in cols[1:]:
+        joined = joined + SEP + df[c].astype(str).str.lower()
+    return joined.tolist()
+
+
+def _codes(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+
+
+def _gram_keys(q):
+    # 1-gram 은 코드포인트 그대로, 2-gram 은 (a << 21 | b) → 항상 2^21 이상이라 두 종류가 겹치지 않는다
+    c = _codes(q)
+    if len(c) == 1:
+        return c
+    return np.unique((c[:-1] << 21) | c[1:])
+
+
+def _tri_keys(c):
+    # 3-gram 은 (a << 42 | b << 21 | c) - 코드포인트 < 2^21 이라 int64 에 들어간다
+    return (c[:-2] << 42) | (c[1:-1] << 21) | c[2:]
+
+
+def _intersect(a, b):
+    # 둘 다 정렬된 고유값 배열 - 작은 쪽을 큰 쪽에 이진 탐색
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return a
+    i = np.searchsorted(b, a)
+    i[i == len(b)] = len(b) - 1
+    return a[b[i] == a]
+
+
+class NgramIndex:
+    def __init__(self, df, cols):
+        self.cols = list(cols)
+        self.version = df.attrs.get("version")
+        self._build(row_texts(df, self.cols))
+
+    def _build(self, texts):
+        self.texts = texts
+        n = len(texts)
+        self.base_to_cur = np.arange(n, dtype=np.int64)
+        self.overlay = []   # 색인 이후 들어온 행의 현재 위치 (정렬)
+        if n == 0:
+            self.grams = self.tri_grams = np.zeros(0, dtype=np.int64)
+            self.offsets = self.tri_offsets = np.zeros(1, dtype=np.int64)
+            self.postings = self.tri_pos = self.row_of = np.zeros(0, dtype=np.int32)
+            return
+        codes = _codes(SEP.join(texts) + SEP)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=n) + 1
+        rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        self.row_of = rows.astype(np.int32)   # 전체 텍스트 위치 → base 행
+
+        ok = codes != 0
+        at = np.flatnonzero(ok[:-2] & ok[1:-1] & ok[2:])
+        tri = _tri_keys(codes)[at]
+        order = np.argsort(tri, kind='stable')   # 같은 3-gram 안에서는 위치 오름차순
+        tri, at = tri[order], at[order]
+        starts = np.flatnonzero(np.r_[True, tri[1:] != tri[:-1]]) if len(tri) else np.zeros(0, dtype=np.int64)
+        self.tri_grams = tri[starts]
+        self.tri_offsets = np.r_[starts, len(tri)].astype(np.int64)
+        self.tri_pos = at.astype(np.int32)
+
+        uni = codes != 0
+        bi = uni[:-1] & uni[1:]
+        keys = np.concatenate([codes[uni], (codes[:-1][bi] << 21) | codes[1:][bi]])
+        rws = np.concatenate([rows[uni], rows[:-1][bi]])
+        order = np.lexsort((rws, keys))
+        keys, rws = keys[order], rws[order]
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (rws[1:] != rws[:-1])
+        keys, rws = keys[keep], rws[keep]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        self.grams = keys[starts]
+        self.offsets = np.r_[starts, len(keys)].astype(np.int64)
+        self.postings = rws.astype(np.int32)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _posting(self, key):
+        i = np.searchsorted(self.grams, key)
+        if i >= len(self.grams) or self.grams[i] != key:
+            return None
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def _match_rows(self, c):
+        # 검색어(코드 배열, 3글자 이상) 가 나오는 base 행 - 0, 3, 6, …, 끝 오프셋의 3-gram 만으로 검색어 전체가 덮인다
+        keys = _tri_keys(c)
+        lists = []
+        for off in sorted(set(range(0, len(c) - 2, 3)) | {len(c) - 3}):
+            i = np.searchsorted(self.tri_grams, keys[off])
+            if i >= len(self.tri_grams) or self.tri_grams[i] != keys[off]:
+                return np.zeros(0, dtype=np.int64)
+            lists.append(self.tri_pos[self.tri_offsets[i]:self.tri_offsets[i + 1]] - np.int32(off))
+        lists.sort(key=len)
+        hit = lists[0]
+        for p in lists[1:]:
+            hit = _intersect(hit, p)
+        rows = self.row_of[hit]   # 위치 순 = 행 순 → 이웃한 중복만 걷어낸다
+        return rows[np.r_[True, rows[1:] != rows[:-1]]] if len(rows) > 1 else rows
+
+    def search(self, query):
+        # 대소문자 무시 부분 문자열 검색 → 현재 행 위치 (오름차순 int64 배열)
+        q = query.lower()
+        if not q:
+            return np.arange(len(self.texts), dtype=np.int64)
+        if SEP in q:
+            return np.zeros(0, dtype=np.int64)
+
+        if len(q) > 2:
+            cand = self._match_rows(_codes(q))
+        else:
+            p = self._posting(_gram_keys(q)[0])
+            cand = p if p is not None else np.zeros(0, dtype=np.int64)
+        hits = self.base_to_cur[cand]
+        hits = hits[hits >= 0]
+
+        if self.overlay:
+            extra = [i for i in self.overlay if q in self.texts[i]]
+            if extra:
+                hits = np.union1d(hits, np.asarray(extra, dtype=np.int64))
+        return hits
+
+    def patched(self, ops, df):
+        # 공개된 색인은 세션들이 잠금 없이 읽는다 → 복사본에 반영해서 돌려준다 (grams 는 읽기만 하므로 공유)
+        new = copy.copy(self)
+        new.texts = list(self.texts)
+        new.base_to_cur = self.base_to_cur.copy()
+        new.apply_changes(ops, df)
+        return new
+
+    def apply_changes(self, ops, df):
+        # ops: [("delete", pos) | ("insert", pos)] - 순서대로 적용, insert 위치는 최종 df 기준
+        for kind, pos in ops:
+            if kind == "delete":
+                self.base_to_cur[self.base_to_cur == pos] = -1
+                self.base_to_cur[self.base_to_cur > pos] -= 1
+                self.overlay = [i - 1 if i > pos else i for i in self.overlay if i != pos]
+                del self.texts[pos]
+            else:
+                self.base_to_cur[self.base_to_cur >= pos] += 1
+                self.overlay = sorted([i + 1 if i >= pos else i for i in self.overlay] + [pos])
+                self.texts.insert(pos, row_texts(df.iloc[[pos]], self.cols)[0])
+        self.version = df.attrs.get("version")
+        if len(self.overlay) > OVERLAY_REBUILD:
+            self._build(self.texts)
@@ -0,0 +1,130 @@
+import copy
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+# --- [목록 화면용 파생 색인] ---
+# 데이터 버전마다 한 번 만들어 두고 (쓰기는 apply_changes 로 증분 반영) 매 rerun 의 전체 스캔을 없앤다.
+# apply_changes 의 ops 는 sheet_sync.patch_english 가 돌려주는 [("delete", pos) | ("insert", pos)] 이다.
+# 세션들이 잠금 없이 읽으므로 공개된 색인은 고치지 않는다 → patched() 로 복사본에 반영해 참조만 바꿔 끼운다.
+
+EMPTY = np.zeros(0, dtype=np.int64)
+RANDOM_RECENT = 200   # 랜덤 10 에서 최근 보여 준 항목을 이만큼 기억해 두고 다시 뽑지 않는다 (?random=fresh)
+
+
+def _shift(arr, kind, pos):
+    if kind == "delete":
+        arr = arr[arr != pos]
+        return np.where(arr > pos, arr - 1, arr)
+    return np.where(arr >= pos, arr + 1, arr)
+
+
+# ★ 분류 → 행 위치 (분류 라디오 선택 / 학습 모드 분류 목록)
+class CategoryIndex:
+    def __init__(self, df, col='분류'):
+        self.col = col
+        self.version = df.attrs.get("version")
+        codes, uniques = pd.factorize(df[col].astype(str).to_numpy()) if not df.empty else (np.zeros(0, dtype=np.int64), [])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self.groups = {u: order[bounds[i]:bounds[i + 1]].astype(np.int64) for i, u in enumerate(uniques)}
+        self._refresh_cats()
+
+    def _refresh_cats(self):
+        self.groups = {c: arr for c, arr in self.groups.items() if len(arr)}
+        self.cats = sorted(c for c in self.groups if c != '')
+
+    def positions(self, cat):
+        return self.groups.get(cat, EMPTY)
+
+    def patched(self, ops, df):
+        new = copy.copy(self)
+        new.groups = dict(self.groups)
+        new.apply_changes(ops, df)
+        return new
+
+    def apply_changes(self, ops, df):
+        for kind, pos in ops:
+            self.groups = {c: _shift(arr, kind, pos) for c, arr in self.groups.items()}
+            if kind == "insert":
+                cat = str(df[self.col].iat[pos])
+                arr = self.groups.get(cat, EMPTY)
+                self.groups[cat] = np.insert(arr, arr.searchsorted(pos), pos)
+        self._refresh_cats()
+        self.version = df.attrs.get("version")
+
+
+# ★ 랜덤 10 - 행 위치 0..n-1 에서 바로 뽑는다 (프레임/Series 복사 없음)
+# cat_index 를 주면 분류마다 같은 확률 (행이 많은 분류로 쏠리지 않게), exclude 위치는 남은 행이 k 개 이상일 때만 뺀다
+def sample_positions(n, k, cat_index=None, exclude=None, rng=None):
+    rng = rng or np.random.default_rng()
+    if n == 0:
+        return EMPTY
+    p = None
+    if cat_index is not None:
+        p = np.zeros(n)
+        for arr in cat_index.groups.values():
+            p[arr] = 1.0 / len(arr)
+    if exclude is not None and n - len(np.unique(exclude)) >= k:
+        p = np.ones(n) if p is None else p
+        p[exclude] = 0.0
+    if p is not None:
+        p /= p.sum()
+    return rng.choice(n, size=min(k, n), replace=False, p=p)
+
+
+# ★ '단어-문장' 오름/내림차순 + 기본(row_idx) 순서 순열 - 필터된 목록은 순위로만 정렬 (문자열 재정렬 없음)
+class SortIndex:
+    def __init__(self, df, col='단어-문장'):
+        self.col = col
+        self.version = df.attrs.get("version")
+        keys = df[col].astype(str).str.lower().tolist() if not df.empty else []
+        self.asc = np.asarray(sorted(range(len(keys)), key=keys.__getitem__), dtype=np.int64)
+        self.sorted_keys = [keys[i] for i in self.asc]   # asc 순서의 키 → 증분 반영 때 이진 탐색
+        self._refresh(df)
+
+    def _refresh(self, df):
+        n = len(self.asc)
+        self.rank_asc = np.empty(n, dtype=np.int64)
+        self.rank_asc[self.asc] = np.arange(n)
+        self.by_row = np.argsort(df['row_idx'].to_numpy(dtype=np.int64), kind='stable') if n else EMPTY
+        self.rank_row = np.empty(n, dtype=np.int64)
+        self.rank_row[self.by_row] = np.arange(n)
+
+    def order(self, positions, mode):
+        # mode: 'asc' / 'desc' / 'row' (row_idx 순) / 그 외 → 주어진 순서 그대로. positions=None 이면 전체
+        if mode not in ('asc', 'desc', 'row'):
+            return np.arange(len(self.asc)) if positions is None else positions
+        perm, rank = (self.by_row, self.rank_row) if mode == 'row' else (self.asc, self.rank_asc)
+        if positions is None:
+            out = perm
+        elif len(positions) * 8 > len(perm):
+            mask = np.zeros(len(perm), dtype=bool)
+            mask[positions] = True
+            out = perm[mask[perm]]
+        else:
+            out = positions[np.argsort(rank[positions], kind='stable')]
+        return out[::-1] if mode == 'desc' else out
+
+    def patched(self, ops, df):
+        new = copy.copy(self)
+        new.sorted_keys = list(self.sorted_keys)
+        new.apply_changes(ops, df)
+        return new
+
+    def apply_changes(self, ops, df):
+        # 한 건마다 이진 탐색 + 배열/리스트 삽입·삭제 한 번 (파이썬 단의 전체 순회 없음)
+        for kind, pos in ops:
+            if kind == "delete":
+                del self.sorted_keys[int(np.flatnonzero(self.asc == pos)[0])]
+                self.asc = _shift(self.asc, kind, pos)
+                continue
+            self.asc = _shift(self.asc, kind, pos)
+            key = str(df[self.col].iat[pos]).lower()
+            lo, hi = bisect_left(self.sorted_keys, key), bisect_right(self.sorted_keys, key)
+            at = lo + int(self.asc[lo:hi].searchsorted(pos))   # 같은 키끼리는 행 위치 순
+            self.sorted_keys.insert(at, key)
+            self.asc = np.insert(self.asc, at, pos)
+        self._refresh(df)
+        self.version = df.attrs.get("version")
@@ -0,0 +1,50 @@
+import re
+import tempfile
+
+import xlsxwriter
+
+# --- [전체 내보내기 (XLSX, 탭마다 시트 하나)] ---
+# xlsxwriter constant_memory 모드: 행을 쓰는 즉시 임시 파일로 내보내 행 수와 상관없이 메모리가 일정하다.
+# 결과는 임시 파일에 쓴 뒤 bytes 로 읽어 돌려준다 - st.download_button 은 파일 객체를 받아도 어차피 전부 읽어
+# 메모리(미디어 파일 저장소)에 올리므로 스트리밍이 되지 않는다. 완성된 파일 한 벌(수십 MB 까지)은 메모리에 있게 된다.
+
+_INVALID = re.compile(r"[\[\]:*?/\\]")
+
+
+def sheet_title(name, used):
+    # 엑셀 시트 이름 규칙 (31자, []:*?/\ 금지, 대소문자 무시 중복 금지)
+    base = _INVALID.sub("_", str(name)).strip("'")[:31] or "Sheet"
+    title, n = base, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(title.lower())
+    return title
+
+
+def write_workbook(fileobj, tabs):
+    # tabs: [(탭 이름, 헤더, 행 목록)] - 행은 위에서부터 순서대로만 쓴다 (constant_memory 제약)
+    wb = xlsxwriter.Workbook(fileobj, {
+        "constant_memory": True,
+        "strings_to_numbers": False,
+        "strings_to_formulas": False,   # '=' 로 시작하는 문장도 글자 그대로
+        "strings_to_urls": False,       # 링크 탭 URL 도 글자 그대로 (시트당 URL 개수 제한 회피)
+    })
+    bold = wb.add_format({"bold": True, "bg_color": "#F2F2F2"})
+    used, total = set(), 0
+    for name, header, rows in tabs:
+        ws = wb.add_worksheet(sheet_title(name, used))
+        ws.freeze_panes(1, 0)
+        ws.write_row(0, 0, header, bold)
+        for r, row in enumerate(rows, start=1):
+            ws.write_row(r, 0, row)
+        total += len(rows)
+    wb.close()
+    return total
+
+
+def build_xlsx(tabs):
+    with tempfile.TemporaryFile() as f:
+        write_workbook(f, tabs)
+        f.seek(0)
+        return f.read()